@@ -1,6 +1,5 @@
 """The Tekmar 482 Gateway Integration."""
 
-import asyncio
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -10,7 +9,16 @@ from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.storage import Store
 
 from . import hub
-from .const import CONF_SETBACK_ENABLE, DOMAIN, STORAGE_KEY, STORAGE_VERSION_MAJOR
+from .const import (
+    CONF_DEVICE_TIMEOUT,
+    CONF_ENGINE,
+    CONF_PUBLISH_INTERVAL,
+    CONF_SETBACK_ENABLE,
+    CONF_TX_BURST,
+    DOMAIN,
+    STORAGE_KEY,
+    STORAGE_VERSION_MAJOR,
+)
 
 PLATFORMS: list[str] = [
     Platform.SENSOR,
@@ -31,16 +39,22 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.data[CONF_HOST],
         entry.data[CONF_PORT],
         entry.options.get(CONF_SETBACK_ENABLE),
+        entry.options.get(CONF_DEVICE_TIMEOUT),
+        entry.options.get(CONF_PUBLISH_INTERVAL),
+        entry.options.get(CONF_TX_BURST),
+        entry.options.get(CONF_ENGINE),
     )
 
-    await tekmar_gateway.async_init_tha()
+    with tekmar_gateway.trace.phase("init_tha"):
+        await tekmar_gateway.async_init_tha()
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = tekmar_gateway
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    with tekmar_gateway.trace.phase("forward_platforms"):
+        await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
-    asyncio.create_task(tekmar_gateway.run())
-    asyncio.create_task(tekmar_gateway.timekeeper())
+    tekmar_gateway.start(entry)
+    tekmar_gateway.trace.mark("setup_entry_done")
 
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
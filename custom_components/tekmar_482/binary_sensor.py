@@ -34,6 +34,7 @@ async def async_setup_entry(
 class ThaBinarySensorBase(BinarySensorEntity):
     """Base class for Tekmar binary sensor entities."""
 
+    tha_methods = None
     should_poll = False
 
     def __init__(self, tekmar_tha, config_entry):
@@ -58,7 +59,7 @@ class ThaBinarySensorBase(BinarySensorEntity):
         return self._config_entry.data["name"]
 
     async def async_added_to_hass(self):
-        self._tekmar_tha.register_callback(self.async_write_ha_state)
+        self._tekmar_tha.register_callback(self.async_write_ha_state, self.tha_methods)
 
     async def async_will_remove_from_hass(self):
         self._tekmar_tha.remove_callback(self.async_write_ha_state)
@@ -67,6 +68,8 @@ class ThaBinarySensorBase(BinarySensorEntity):
 class ReportingState(ThaBinarySensorBase):
     """Boolean status for gateway reporting state."""
 
+    tha_methods = ("ReportingState",)
+
     entity_category = EntityCategory.DIAGNOSTIC
     device_class = BinarySensorDeviceClass.RUNNING
 
@@ -86,6 +89,8 @@ class ReportingState(ThaBinarySensorBase):
 class SetbackEnable(ThaBinarySensorBase):
     """Boolean status for gateway setback mode."""
 
+    tha_methods = ()
+
     entity_category = EntityCategory.DIAGNOSTIC
     device_class = BinarySensorDeviceClass.RUNNING
 
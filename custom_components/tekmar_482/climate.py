@@ -16,12 +16,11 @@ from homeassistant.components.climate.const import ClimateEntityFeature as Featu
 from homeassistant.components.climate.const import HVACAction, HVACMode
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import (
-    DEVICE_FEATURES,
-    DEVICE_TYPES,
     DOMAIN,
     ThaActiveDemand,
     ThaDeviceMode,
@@ -41,16 +40,34 @@ async def async_setup_entry(
     entities = []
 
     for device in hub.tha_devices:
-        if DEVICE_TYPES[device.tha_device["type"]] == ThaType.THERMOSTAT:
-            entities.append(ThaClimateThermostat(device, config_entry))
+        entities.extend(_device_entities(hub, device, config_entry))
 
     if entities:
         async_add_entities(entities)
 
+    @callback
+    def async_add_device(device) -> None:
+        async_add_entities(_device_entities(hub, device, config_entry))
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, hub.signal_device_added, async_add_device)
+    )
+
+
+def _device_entities(hub, device, config_entry) -> list[ClimateEntity]:
+    """Create the climate entities for a device."""
+    entities = []
+
+    if device.profile.device_type == ThaType.THERMOSTAT:
+        entities.append(ThaClimateThermostat(device, config_entry))
+
+    return entities
+
 
 class ThaClimateBase(ClimateEntity):
     """Base class for Tekmar climate entities."""
 
+    tha_methods = None
     should_poll = False
     _enable_turn_on_off_backwards_compatibility = False
 
@@ -75,7 +92,7 @@ class ThaClimateBase(ClimateEntity):
         return self._config_entry.data["name"]
 
     async def async_added_to_hass(self):
-        self._tekmar_tha.register_callback(self.async_write_ha_state)
+        self._tekmar_tha.register_callback(self.async_write_ha_state, self.tha_methods)
 
     async def async_will_remove_from_hass(self):
         self._tekmar_tha.remove_callback(self.async_write_ha_state)
@@ -84,6 +101,19 @@ class ThaClimateBase(ClimateEntity):
 class ThaClimateThermostat(ThaClimateBase):
     """A Tekmar thermostat entity."""
 
+    tha_methods = (
+        "CurrentTemperature",
+        "RelativeHumidity",
+        "HeatSetpoint",
+        "CoolSetpoint",
+        "FanPercent",
+        "HumiditySetMin",
+        "HumiditySetMax",
+        "SetbackState",
+        "ModeSetting",
+        "ActiveDemand",
+    )
+
     temperature_unit = UnitOfTemperature.CELSIUS
     max_humidity = 80
     min_humidity = 20
@@ -131,18 +161,15 @@ class ThaClimateThermostat(ThaClimateBase):
     def supported_features(self):
         supported_features = Feature.TURN_OFF
 
-        if (
-            self._tekmar_tha.tha_device["attributes"].ZoneHeating == 1
-            and self._tekmar_tha.tha_device["attributes"].ZoneCooling == 1
-        ):
+        if self._tekmar_tha.profile.heat_cool:
             supported_features = supported_features | Feature.TARGET_TEMPERATURE_RANGE
         else:
             supported_features = supported_features | Feature.TARGET_TEMPERATURE
 
-        if self._tekmar_tha.tha_device["attributes"].FanPercent == 1:
+        if self._tekmar_tha.profile.fan_percent:
             supported_features = supported_features | Feature.FAN_MODE
 
-        if DEVICE_FEATURES[self._tekmar_tha.tha_device["type"]]["humid"]:
+        if self._tekmar_tha.profile.humidity:
             if (
                 self._tekmar_tha.humidity_setpoint_min != ThaValue.NA_8
                 or self._tekmar_tha.humidity_setpoint_max != ThaValue.NA_8
@@ -156,10 +183,7 @@ class ThaClimateThermostat(ThaClimateBase):
 
     @property
     def current_temperature(self):
-        if self._tekmar_tha.current_temperature == ThaValue.NA_16:
-            return None
-
-        elif self._tekmar_tha.current_temperature is None:
+        if self._tekmar_tha.current_temperature is None:
             return None
 
         else:
@@ -173,10 +197,7 @@ class ThaClimateThermostat(ThaClimateBase):
 
     @property
     def current_humidity(self):
-        if (
-            self._tekmar_tha.relative_humidity == ThaValue.NA_8
-            or self._tekmar_tha.relative_humidity is None
-        ):
+        if self._tekmar_tha.relative_humidity is None:
             return None
 
         else:
@@ -186,16 +207,13 @@ class ThaClimateThermostat(ThaClimateBase):
     def hvac_modes(self) -> list[str]:
         hvac_modes = [HVACMode.OFF]
 
-        if self._tekmar_tha.tha_device["attributes"].ZoneHeating == 1:
+        if self._tekmar_tha.profile.zone_heating:
             hvac_modes.append(HVACMode.HEAT)
 
-        if self._tekmar_tha.tha_device["attributes"].ZoneCooling == 1:
+        if self._tekmar_tha.profile.zone_cooling:
             hvac_modes.append(HVACMode.COOL)
 
-        if (
-            self._tekmar_tha.tha_device["attributes"].ZoneHeating == 1
-            and self._tekmar_tha.tha_device["attributes"].ZoneCooling == 1
-        ):
+        if self._tekmar_tha.profile.heat_cool:
             hvac_modes.append(HVACMode.HEAT_COOL)
 
         return hvac_modes
@@ -219,14 +237,14 @@ class ThaClimateThermostat(ThaClimateBase):
 
     @property
     def fan_modes(self):
-        if self._tekmar_tha.tha_device["attributes"].FanPercent == 1:
+        if self._tekmar_tha.profile.fan_percent:
             return [FAN_ON, FAN_AUTO]
         else:
             return None
 
     @property
     def fan_mode(self):
-        if self._tekmar_tha.tha_device["type"] in [99203, 99202, 99201]:
+        if self._tekmar_tha.profile.fan_steps:
             if self._tekmar_tha.fan_percent == 10:
                 return FAN_ON
             else:
@@ -306,16 +324,16 @@ class ThaClimateThermostat(ThaClimateBase):
 
     @property
     def target_temperature(self):
-        if self._tekmar_tha.tha_device["attributes"].ZoneHeating == 1:
+        if self._tekmar_tha.profile.zone_heating:
             this_device_setpoint = self._tekmar_tha.heat_setpoint
 
-        elif self._tekmar_tha.tha_device["attributes"].ZoneCooling == 1:
+        elif self._tekmar_tha.profile.zone_cooling:
             this_device_setpoint = self._tekmar_tha.cool_setpoint
 
         else:
             return None
 
-        if this_device_setpoint == ThaValue.NA_8 or this_device_setpoint is None:
+        if this_device_setpoint is None:
             return None
 
         else:
@@ -329,10 +347,7 @@ class ThaClimateThermostat(ThaClimateBase):
 
     @property
     def target_temperature_high(self):
-        if (
-            self._tekmar_tha.cool_setpoint == ThaValue.NA_8
-            or self._tekmar_tha.cool_setpoint is None
-        ):
+        if self._tekmar_tha.cool_setpoint is None:
             return None
 
         else:
@@ -344,10 +359,7 @@ class ThaClimateThermostat(ThaClimateBase):
 
     @property
     def target_temperature_low(self):
-        if (
-            self._tekmar_tha.heat_setpoint == ThaValue.NA_8
-            or self._tekmar_tha.heat_setpoint is None
-        ):
+        if self._tekmar_tha.heat_setpoint is None:
             return None
 
         else:
@@ -362,10 +374,10 @@ class ThaClimateThermostat(ThaClimateBase):
         cool_setpoint = None
 
         if self.supported_features & Feature.TARGET_TEMPERATURE:
-            if self._tekmar_tha.tha_device["attributes"].ZoneHeating == 1:
+            if self._tekmar_tha.profile.zone_heating:
                 heat_setpoint = kwargs.get(ATTR_TEMPERATURE)
 
-            elif self._tekmar_tha.tha_device["attributes"].ZoneCooling == 1:
+            elif self._tekmar_tha.profile.zone_cooling:
                 cool_setpoint = kwargs.get(ATTR_TEMPERATURE)
 
         elif self.supported_features & Feature.TARGET_TEMPERATURE_RANGE:
@@ -399,7 +411,7 @@ class ThaClimateThermostat(ThaClimateBase):
 
     async def async_set_fan_mode(self, fan_mode):
         if fan_mode == FAN_ON:
-            if self._tekmar_tha.tha_device["type"] in [99203, 99202, 99201]:
+            if self._tekmar_tha.profile.fan_steps:
                 value = 10
             else:
                 value = 100
@@ -13,11 +13,25 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 
 from .const import (
+    CONF_DEVICE_TIMEOUT,
+    CONF_ENGINE,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_PUBLISH_INTERVAL,
     CONF_SETBACK_ENABLE,
+    CONF_TEMP_DEADBAND,
+    CONF_TX_BURST,
+    DEFAULT_DEVICE_TIMEOUT,
+    DEFAULT_ENGINE,
     DEFAULT_HOST,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_MIN_WRITE_INTERVAL,
     DEFAULT_NAME,
     DEFAULT_PORT,
+    DEFAULT_PUBLISH_INTERVAL,
     DEFAULT_SETBACK_ENABLE,
+    DEFAULT_TEMP_DEADBAND,
+    DEFAULT_TX_BURST,
     DOMAIN,
 )
 from .helpers import host_valid
@@ -50,7 +64,8 @@ class TekmarGatewayConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
 
         if user_input is not None:
-            user_input[CONF_HOST] = user_input[CONF_HOST].lower()
+            if not user_input[CONF_HOST].startswith("/"):
+                user_input[CONF_HOST] = user_input[CONF_HOST].lower()
 
             if not host_valid(user_input[CONF_HOST]):
                 errors[CONF_HOST] = "invalid_host"
@@ -100,17 +115,30 @@ class TekmarGatewayOptionsFlowHandler(OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(title="", data=user_input)
         else:
-            if self.config_entry.options.get(CONF_SETBACK_ENABLE) is None:
-                user_input = {
-                    CONF_SETBACK_ENABLE: DEFAULT_SETBACK_ENABLE,
-                }
-
-            else:
-                user_input = {
-                    CONF_SETBACK_ENABLE: self.config_entry.options.get(
-                        CONF_SETBACK_ENABLE
-                    ),
-                }
+            user_input = {
+                CONF_SETBACK_ENABLE: self.config_entry.options.get(
+                    CONF_SETBACK_ENABLE, DEFAULT_SETBACK_ENABLE
+                ),
+                CONF_DEVICE_TIMEOUT: self.config_entry.options.get(
+                    CONF_DEVICE_TIMEOUT, DEFAULT_DEVICE_TIMEOUT
+                ),
+                CONF_PUBLISH_INTERVAL: self.config_entry.options.get(
+                    CONF_PUBLISH_INTERVAL, DEFAULT_PUBLISH_INTERVAL
+                ),
+                CONF_TEMP_DEADBAND: self.config_entry.options.get(
+                    CONF_TEMP_DEADBAND, DEFAULT_TEMP_DEADBAND
+                ),
+                CONF_HUMIDITY_DEADBAND: self.config_entry.options.get(
+                    CONF_HUMIDITY_DEADBAND, DEFAULT_HUMIDITY_DEADBAND
+                ),
+                CONF_MIN_WRITE_INTERVAL: self.config_entry.options.get(
+                    CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+                ),
+                CONF_TX_BURST: self.config_entry.options.get(
+                    CONF_TX_BURST, DEFAULT_TX_BURST
+                ),
+                CONF_ENGINE: self.config_entry.options.get(CONF_ENGINE, DEFAULT_ENGINE),
+            }
 
         return self.async_show_form(
             step_id="init",
@@ -119,6 +147,30 @@ class TekmarGatewayOptionsFlowHandler(OptionsFlow):
                     vol.Optional(
                         CONF_SETBACK_ENABLE, default=user_input[CONF_SETBACK_ENABLE]
                     ): cv.boolean,
+                    vol.Optional(
+                        CONF_DEVICE_TIMEOUT, default=user_input[CONF_DEVICE_TIMEOUT]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=1440)),
+                    vol.Optional(
+                        CONF_PUBLISH_INTERVAL,
+                        default=user_input[CONF_PUBLISH_INTERVAL],
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_TEMP_DEADBAND, default=user_input[CONF_TEMP_DEADBAND]
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=5)),
+                    vol.Optional(
+                        CONF_HUMIDITY_DEADBAND,
+                        default=user_input[CONF_HUMIDITY_DEADBAND],
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=20)),
+                    vol.Optional(
+                        CONF_MIN_WRITE_INTERVAL,
+                        default=user_input[CONF_MIN_WRITE_INTERVAL],
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3600)),
+                    vol.Optional(
+                        CONF_TX_BURST, default=user_input[CONF_TX_BURST]
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=12)),
+                    vol.Optional(
+                        CONF_ENGINE, default=user_input[CONF_ENGINE]
+                    ): cv.boolean,
                 },
             ),
             errors=errors,
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import ctypes
 import re
 import sys
 from enum import IntEnum
+from typing import NamedTuple
 
 if sys.version_info.minor >= 11:
     # Needs Python 3.11
@@ -21,19 +21,74 @@ else:
             pass
 
 
-c_uint = ctypes.c_uint
-
 DOMAIN = "tekmar_482"
 ATTR_MANUFACTURER = "Tekmar"
 DEFAULT_NAME = "tekmarNet"
 DEFAULT_HOST = ""
 DEFAULT_PORT = 3000
 DEFAULT_SETBACK_ENABLE = False
+DEFAULT_DEVICE_TIMEOUT = 60
+DEFAULT_PUBLISH_INTERVAL = 0
+DEFAULT_TEMP_DEADBAND = 0
+DEFAULT_HUMIDITY_DEADBAND = 0
+DEFAULT_MIN_WRITE_INTERVAL = 0
+DEFAULT_TX_BURST = 1
+DEFAULT_ENGINE = False
 CONF_SETBACK_ENABLE = "setback_enable"
+CONF_DEVICE_TIMEOUT = "device_timeout"
+CONF_PUBLISH_INTERVAL = "publish_interval"
+CONF_TEMP_DEADBAND = "temperature_deadband"
+CONF_HUMIDITY_DEADBAND = "humidity_deadband"
+CONF_MIN_WRITE_INTERVAL = "min_write_interval"
+CONF_TX_BURST = "tx_burst"
+CONF_ENGINE = "engine"
 
 STORAGE_VERSION_MAJOR = 1
 STORAGE_KEY = DOMAIN
 
+SIGNAL_DEVICE_ADDED = f"{DOMAIN}_device_added_{{}}"
+
+# seconds between writes to the gateway, which drops packets written too fast
+TX_PACE = 0.1
+
+# seconds before a cached field is requested again after a reconnect
+DEFAULT_RESYNC_AGE = 300
+
+# seconds between bursts of refresh requests, sent when nothing else is
+# queued, so received reports are still read in between
+REFRESH_SPACING = 0.5
+
+# reconnect backoff and shutdown timing, in seconds
+RECONNECT_DELAY_BASE = 0.5
+RECONNECT_DELAY_MAX = 60
+SHUTDOWN_TIMEOUT = 2
+
+# seconds to wait for the gateway information during setup
+SETUP_TIMEOUT = 30
+
+# seconds to wait for a reply to a liveness probe
+PROBE_TIMEOUT = 60
+
+# seconds to wait for the inventory replies of a new device before the
+# missing ones are requested again
+DISCOVERY_TIMEOUT = 30
+
+# TCP keepalive: seconds idle before the first probe, seconds between probes
+# and unanswered probes before the OS drops the connection
+KEEPALIVE_IDLE = 10
+KEEPALIVE_INTERVAL = 5
+KEEPALIVE_COUNT = 3
+
+# seconds without a received line before a heartbeat request is sent, and
+# seconds to wait for any line after it before reconnecting
+HEARTBEAT_IDLE = 15
+HEARTBEAT_TIMEOUT = 5
+
+# seconds between runtime sensor updates while a zone has demand, and between
+# saves of the runtime accumulators to storage
+RUNTIME_UPDATE_INTERVAL = 60
+RUNTIME_SAVE_INTERVAL = 600
+
 # from voluptuous/validators.py
 DOMAIN_REGEX = re.compile(
     # start anchor, because fullmatch is not available in python 2.7
@@ -143,6 +198,48 @@ SETBACK_FAN_MAP = {
     ThaSetback.AWAY: 0x01,
 }
 
+# Methods that report cached device state. The value names the body field that
+# selects one of several values for the same address, or None.
+STATE_METHODS = {
+    "OutdoorTemperature": None,
+    "SetpointGroupEnable": "groupid",
+    "CurrentTemperature": None,
+    "CurrentFloorTemperature": None,
+    "RelativeHumidity": None,
+    "ActiveDemand": None,
+    "SetbackState": None,
+    "SetbackEvents": None,
+    "ModeSetting": None,
+    "HeatSetpoint": "setback",
+    "CoolSetpoint": "setback",
+    "SlabSetpoint": "setback",
+    "FanPercent": "setback",
+    "SetpointDevice": "setback",
+    "HumiditySetMin": None,
+    "HumiditySetMax": None,
+}
+
+# Seconds without a report before a cached field is requested again by the
+# background refresher. Methods not listed here are never refreshed.
+STATE_REFRESH_AGE = {
+    "OutdoorTemperature": 1800,
+    "SetpointGroupEnable": 3600,
+    "CurrentTemperature": 1800,
+    "CurrentFloorTemperature": 1800,
+    "RelativeHumidity": 1800,
+    "ActiveDemand": 1800,
+    "SetbackState": 1800,
+    "SetbackEvents": 3600,
+    "ModeSetting": 1800,
+    "HeatSetpoint": 3600,
+    "CoolSetpoint": 3600,
+    "SlabSetpoint": 3600,
+    "FanPercent": 3600,
+    "SetpointDevice": 1800,
+    "HumiditySetMin": 3600,
+    "HumiditySetMax": 3600,
+}
+
 DEVICE_TYPES = {
     101101: ThaType.SETPOINT,
     101102: ThaType.SETPOINT,
@@ -414,18 +511,11 @@ DEVICE_FEATURES = {
 }
 
 
-class _DeviceAttributes(ctypes.LittleEndianStructure):
-    _fields_ = [
-        ("ZoneHeating", c_uint, 1),
-        ("ZoneCooling", c_uint, 1),
-        ("SlabSetpoint", c_uint, 1),
-        ("FanPercent", c_uint, 1),
-    ]
-
-
-class DeviceAttributes(ctypes.Union):
-    _anonymous_ = ("bit",)
-    _fields_ = [("bit", _DeviceAttributes), ("attrs", c_uint)]
+class DeviceAttributes(NamedTuple):
+    ZoneHeating: bool = False
+    ZoneCooling: bool = False
+    SlabSetpoint: bool = False
+    FanPercent: bool = False
 
 
 TN_ERRORS = {
@@ -33,20 +33,54 @@ async def async_get_config_entry_diagnostics(
                 "pr_ver": gateway.hub.tha_pr_ver,
                 "reporting_state": gateway.reporting_state,
                 "setback_enable": gateway.setback_enable,
+                "suppressed_updates": gateway.suppressed_updates,
+                "outdoor_temperature": gateway.outdoor_temprature,
+                "zones_calling_for_heat": gateway.zones_calling_for_heat,
+                "zone_temperature_average": gateway.zone_temperature_average,
+                "zone_temperature_minimum": gateway.zone_temperature_minimum,
             }
         }
         data.update(async_redact_data(gateway, REDACT_GATEWAY))
 
     for device in hub.tha_devices:
-        device: dict[str, Any] = {
-            f"device_{device.device_id}": {
-                "id": device.device_id,
-                "type": device.tha_device_type,
-                "device_info": device.device_info,
-            }
+        device_data: dict[str, Any] = {
+            "id": device.device_id,
+            "type": device.tha_device_type,
+            "device_info": device.device_info,
+            "suppressed_updates": device.suppressed_updates,
+            "runtime": device.runtime.as_dict()["totals"],
         }
-        data.update(async_redact_data(device, REDACT_DEVICE))
+
+        # latest reported values, before any sensor deadband is applied
+        for attr in [
+            "current_temperature",
+            "current_floor_temperature",
+            "relative_humidity",
+        ]:
+            if hasattr(device, attr):
+                device_data[attr] = getattr(device, attr)
+
+        data.update(
+            async_redact_data(
+                {f"device_{device.device_id}": device_data}, REDACT_DEVICE
+            )
+        )
 
     data.update({"ignored": hub.tha_ignore_addr})
+    data.update({"skipped_decodes": hub.skipped_decodes})
+    data.update({"conflated_reports": hub.conflated_reports})
+    data.update({"decode_cache": hub.decode_cache})
+    data.update({"heartbeat_rtt": hub.rtt})
+    data.update({"startup": hub.trace.as_dict()})
+    data.update({"startup_chrome_trace": hub.trace.chrome_trace()})
+    data.update(
+        {
+            "frames": {
+                "received": hub.frame_parser.frames,
+                "corrupt": hub.frame_parser.corrupt,
+                "oversized": hub.frame_parser.oversized,
+            }
+        }
+    )
 
     return data
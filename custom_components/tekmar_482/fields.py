@@ -234,7 +234,7 @@ class Bitfield(FieldList):
         self.name = name
         self.order = order
         self.fields = lst
-        size = (sum([f.size for f in lst]) + 7) / 8
+        size = (sum([f.size for f in lst]) + 7) // 8
         if size == 1:
             self.helper = Int8(None)
         elif size == 2:
@@ -247,18 +247,26 @@ class Bitfield(FieldList):
             raise FieldError("Maximum bitfield width of 32 exceeded.")
         self.size = self.helper.size
 
+        # Precompute the offset and mask of each bit-granular field.
+        layout = []
+        offset = 0
+        for f in lst:
+            layout.append((offset, Bitfield.width_table[f.size]))
+            offset += f.size
+        self.layout = tuple(layout)
+
     # --------------------------------------------------------------------------
     def unpack(self, bytes):
         """Similar to the unpack method for the Field object except a series
         of bit-granular Fields and FieldLists can be unpacked.
         """
         total, bytes = self.helper.unpack(bytes)
-        total = total[0]
-        vals = []
-        for f in [f.size for f in self.fields]:
-            vals.append(total & Bitfield.width_table[f])
-            total >>= f
-        return vals, bytes
+        return self.decode(total[0]), bytes
+
+    # --------------------------------------------------------------------------
+    def decode(self, total):
+        """Split an integer into the values of the bit-granular fields."""
+        return [(total >> offset) & mask for offset, mask in self.layout]
 
     # --------------------------------------------------------------------------
     def pack(self, values):
@@ -266,10 +274,8 @@ class Bitfield(FieldList):
         of bit-granular Fields and FieldLists can be packed.
         """
         val = 0
-        offset = 0
-        for f in [f.size for f in self.fields]:
-            val |= (values.pop(0) & Bitfield.width_table[f]) << offset
-            offset += f
+        for offset, mask in self.layout:
+            val |= (values.pop(0) & mask) << offset
         values.insert(0, val)
         return self.helper.pack(values)
 
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import ipaddress
+import random
 
 from .const import DOMAIN_REGEX
 
@@ -35,8 +36,24 @@ def degHtoC(degH):
     return degFtoC(degHtoF(degH))
 
 
+def backoff_delay(attempt, base, cap):
+    """Return the delay before reconnect attempt number attempt.
+
+    The first attempt is immediate. After that the delay doubles from base up
+    to cap, with the upper half of each delay randomized.
+    """
+    if attempt <= 0:
+        return 0
+
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
 def host_valid(host):
-    """Return True if hostname or IP address is valid."""
+    """Return True if hostname, IP address or unix socket path is valid."""
+    if host.startswith("/"):
+        return True
+
     try:
         if ipaddress.ip_address(host).version == (4 or 6):
             return True
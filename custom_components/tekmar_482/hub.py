@@ -1,34 +1,95 @@
 import asyncio
 import logging
+import time
+from collections import Counter, deque
 from typing import Any, Callable, Dict, Optional
 
-from homeassistant.core import HomeAssistant
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import issue_registry as ir
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.storage import Store
 from homeassistant.util import dt
 
 from .const import (
     ATTR_MANUFACTURER,
+    DEFAULT_DEVICE_TIMEOUT,
+    DEFAULT_ENGINE,
+    DEFAULT_RESYNC_AGE,
     DEFAULT_SETBACK_ENABLE,
+    DEFAULT_TX_BURST,
     DEVICE_FEATURES,
     DEVICE_TYPES,
+    DISCOVERY_TIMEOUT,
     DOMAIN,
+    HEARTBEAT_IDLE,
+    HEARTBEAT_TIMEOUT,
+    PROBE_TIMEOUT,
+    RECONNECT_DELAY_BASE,
+    RECONNECT_DELAY_MAX,
+    REFRESH_SPACING,
+    RUNTIME_SAVE_INTERVAL,
+    RUNTIME_UPDATE_INTERVAL,
     SETBACK_FAN_MAP,
     SETBACK_SETPOINT_MAP,
+    SETUP_TIMEOUT,
+    SHUTDOWN_TIMEOUT,
+    SIGNAL_DEVICE_ADDED,
+    STATE_METHODS,
+    STATE_REFRESH_AGE,
     STORAGE_KEY,
     STORAGE_VERSION_MAJOR,
+    TX_PACE,
     DeviceAttributes,
+    ThaActiveDemand,
     ThaDefault,
     ThaSetback,
     ThaType,
     ThaValue,
 )
-from .trpc_msg import TrpcPacket, name_from_methodID
-from .trpc_sock import TrpcSocket
+from .helpers import backoff_delay
+from .inbound import InboundQueue
+from .profile import DeviceProfile
+from .protocol import CONFLATE_KEY_LENGTHS
+from .runtime import DemandRuntime
+from .startup_trace import StartupTrace
+from .state import ZoneStateTable
+from .timer_wheel import TimerWheel
+from .trpc_msg import (
+    TrpcPacket,
+    decode_cached,
+    methodID_from_name,
+    name_from_methodID,
+    peek_cached,
+    serviceID_from_name,
+)
+from .trpc_sock import FrameParser, TrpcSocket
 
 _LOGGER = logging.getLogger(__name__)
 
+# Methods that are received but never acted on after setup.
+SKIP_METHOD_IDS = frozenset(
+    [methodID_from_name["NullMethod"], methodID_from_name["DateTime"]]
+)
+
+# state reports that trigger follow-up requests are always decoded
+UNGATED_METHODS = frozenset(["ActiveDemand", "SetbackState", "SetbackEvents"])
+
+# zone fields that feed gateway aggregates, with the aggregates they feed
+AGGREGATE_FIELDS = {
+    "current_temperature": ("ZoneTemperatureAverage", "ZoneTemperatureMinimum"),
+    "active_demand": ("ZonesCallingForHeat",),
+}
+
+# zone reports that feed gateway aggregates
+AGGREGATE_METHODS = {
+    "CurrentTemperature": AGGREGATE_FIELDS["current_temperature"],
+    "ActiveDemand": AGGREGATE_FIELDS["active_demand"],
+}
+
 
 class TekmarHub:
     """Tekmar hub for communicating with the gateway addon."""
@@ -41,6 +102,10 @@ class TekmarHub:
         host: str,
         port: int,
         opt_setback_enable: bool,
+        opt_device_timeout: int | None = None,
+        opt_publish_interval: int | None = None,
+        opt_tx_burst: int | None = None,
+        opt_engine: bool | None = None,
     ) -> None:
         self._hass = hass
         self._entry_id = entry_id
@@ -53,6 +118,27 @@ class TekmarHub:
         else:
             self._opt_setback_enable = opt_setback_enable
 
+        if opt_device_timeout is None:
+            self._device_timeout = DEFAULT_DEVICE_TIMEOUT * 60
+        else:
+            self._device_timeout = opt_device_timeout * 60
+
+        if not opt_publish_interval:
+            self._publish_interval = None
+        else:
+            self._publish_interval = opt_publish_interval * 60
+
+        if opt_tx_burst is None:
+            self._tx_burst = DEFAULT_TX_BURST
+        else:
+            self._tx_burst = opt_tx_burst
+
+        if opt_engine is None:
+            opt_engine = DEFAULT_ENGINE
+
+        # the standalone engine paces writes to the gateway itself
+        self._tx_pace = 0 if opt_engine else TX_PACE
+
         self._id = name.lower()
         self._online = False
         self._sock = TrpcSocket(host, port)
@@ -60,9 +146,16 @@ class TekmarHub:
         self._storage = StoredData(self._hass, self._entry_id)
 
         self._tha_inventory = {}
+        self._tha_discovery = {}
+        self._tha_inventory_seen = None
+        self._tha_inventory_missing = set()
         self.tha_gateway = []
         self.tha_devices = []
+        self._devices_by_address = {}
         self.tha_ignore_addr = []
+        self.zone_state = ZoneStateTable()
+        self._runtime = {}
+        self._stored_runtime = {}
 
         self._tha_fw_ver = None
         self._tha_pr_ver = None
@@ -71,16 +164,46 @@ class TekmarHub:
 
         self._inRun = False
         self._inSetup = False
+        self.trace = StartupTrace()
         self._inReconnect = False
 
+        self._tasks = []
         self._tx_queue = []
+        self._inbound = InboundQueue(CONFLATE_KEY_LENGTHS)
+        self._skipped_decodes = 0
+
+        self._last_rx = None
+        self._heartbeat_sent = None
+        self._rtt = None
+
+        self._tha_last_update = {}
+        self._tha_last_request = {}
+        self._refresh_queue = deque()
+        self._refresh_pending = set()
+        self._resync_age = DEFAULT_RESYNC_AGE
+
+        self._tha_last_seen = {}
+        self._tha_probed = set()
+        self._tha_offline = set()
+        self._liveness = TimerWheel(1.0, 512, time.monotonic())
 
     async def async_init_tha(self) -> None:
+        """Connect and read the gateway information.
+
+        Only the firmware, protocol and setback replies are waited for. The
+        inventory is requested at the end and each device is added by the run
+        loop as soon as its own inventory is complete.
+        """
         self._inSetup = True
 
-        await self.storage_put("storage", True)
+        with self.trace.phase("storage"):
+            await self.storage_put("storage", True)
+            self._stored_runtime = await self.storage_get("runtime") or {}
+
+        with self.trace.phase("socket_open"):
+            sock_open = await self._sock.open()
 
-        if await self._sock.open() is False:
+        if sock_open is False:
             _LOGGER.error(self._sock.error)
             ir.async_create_issue(
                 self._hass,
@@ -95,9 +218,18 @@ class TekmarHub:
                 f"Connection to packet server '{self._host}' failed"
             )
 
-        await self._sock.write(
-            TrpcPacket(service="Update", method="ReportingState", state=ThaValue.OFF)
-        )
+        self._last_rx = time.monotonic()
+
+        with self.trace.phase("reporting_off"):
+            try:
+                await self._sock.write(
+                    TrpcPacket(
+                        service="Update", method="ReportingState", state=ThaValue.OFF
+                    )
+                )
+            except Exception as e:
+                _LOGGER.error(f"Write error: {e}")
+                await self._async_abort_setup("Write error while in setup.")
 
         self._tx_queue.append(
             TrpcPacket(
@@ -124,215 +256,109 @@ class TekmarHub:
             )
         )
 
-        # inventory must be last
-        self._tx_queue.append(
-            TrpcPacket(service="Request", method="DeviceInventory", address=0x0)
-        )
+        setup_deadline = time.monotonic() + SETUP_TIMEOUT
+        self.trace.begin("gateway_info")
 
         while self._inSetup is True:
+            if time.monotonic() > setup_deadline:
+                await self._async_abort_setup(
+                    f"No reply from packet server '{self._host}' during setup."
+                )
+
             if len(self._tx_queue) != 0:
                 try:
-                    writePacket = self._tx_queue.pop(0)
-                    _LOGGER.debug(f"Setup {writePacket}")
-                    await self._sock.write(writePacket)
-                    await asyncio.sleep(0.1)  # writing too fast causes errors
+                    writePackets = self._pop_tx_burst()
+                    for writePacket in writePackets:
+                        _LOGGER.debug(f"Setup {writePacket}")
+                    await self._sock.write_many(writePackets)
+                    if self._tx_pace:
+                        await asyncio.sleep(self._tx_pace)
                 except Exception as e:
                     _LOGGER.error(f"Write error: {e}")
-                    raise ConfigEntryNotReady("Write error while in setup.")
+                    await self._async_abort_setup("Write error while in setup.")
 
             try:
                 p = await self._sock.read()
 
             except Exception as e:
                 _LOGGER.error(f"Read error: {e}")
-                raise ConfigEntryNotReady("Read error while in setup.")
+                await self._async_abort_setup("Read error while in setup.")
 
             if p is not None:
-                try:
-                    h = p.header
-                    b = p.body
-                    tha_method = name_from_methodID[h["methodID"]]
-
-                    _LOGGER.debug(f"Setup {p}")
+                tha_method = p.method
 
-                    if tha_method in ["FirmwareRevision"]:
-                        self._tha_fw_ver = b["revision"]
+                _LOGGER.debug(f"Setup {p}")
 
-                    elif tha_method in ["ProtocolVersion"]:
-                        self._tha_pr_ver = b["version"]
+                if tha_method in ["FirmwareRevision"]:
+                    self._tha_fw_ver = p.revision
 
-                    elif tha_method in ["SetbackEnable"]:
-                        self._tha_setback_enable = b["enable"]
+                elif tha_method in ["ProtocolVersion"]:
+                    self._tha_pr_ver = p.version
 
-                    elif tha_method in ["ReportingState"]:
-                        self._tha_reporting_state = b["state"]
+                elif tha_method in ["SetbackEnable"]:
+                    self._tha_setback_enable = p.enable
 
-                        if self._tha_reporting_state == 1:
-                            self._inSetup = False
-
-                    elif tha_method in ["DeviceInventory"]:
-                        if b["address"] > 0:
-                            _LOGGER.debug(f"Setting up address {b['address']}")
-
-                            self._tha_inventory[b["address"]] = {
-                                "entity": "",
-                                "type": "",
-                                "version": "",
-                                "events": "",
-                                "attributes": DeviceAttributes(),
-                            }
-
-                            self._tx_queue.append(
-                                TrpcPacket(
-                                    service="Request",
-                                    method="DeviceType",
-                                    address=b["address"],
-                                )
-                            )
-                            self._tx_queue.append(
-                                TrpcPacket(
-                                    service="Request",
-                                    method="DeviceVersion",
-                                    address=b["address"],
-                                )
-                            )
-                            self._tx_queue.append(
-                                TrpcPacket(
-                                    service="Request",
-                                    method="DeviceAttributes",
-                                    address=b["address"],
-                                )
-                            )
-                            self._tx_queue.append(
-                                TrpcPacket(
-                                    service="Request",
-                                    method="SetbackEvents",
-                                    address=b["address"],
-                                )
-                            )
-                        else:
-                            # inventory complete
-                            self._tx_queue.append(
-                                TrpcPacket(
-                                    service="Update",
-                                    method="ReportingState",
-                                    state=ThaValue.ON,
-                                )
-                            )
-
-                    elif tha_method in ["DeviceType"]:
-                        try:
-                            self._tha_inventory[b["address"]]["type"] = b["type"]
-                            self._tha_inventory[b["address"]]["entity"] = (
-                                "{3} {0} {1} {2}".format(
-                                    DEVICE_TYPES[
-                                        self._tha_inventory[b["address"]]["type"]
-                                    ].capitalize(),
-                                    DEVICE_FEATURES[
-                                        self._tha_inventory[b["address"]]["type"]
-                                    ]["model"],
-                                    b["address"],
-                                    self._name.capitalize(),
-                                )
-                            )
-                            _LOGGER.debug(f"Address {b['address']} type {b['type']}")
-
-                        except KeyError:
-                            _LOGGER.warning(
-                                (
-                                    f"Unknown device type {b['type']} at address "
-                                    f"{b['address']}. This address will be ignored."
-                                )
-                            )
-
-                            self.tha_ignore_addr.append(b["address"])
-
-                    elif tha_method in ["DeviceAttributes"]:
-                        _LOGGER.debug(
-                            f"Address {b['address']} attributes {b['attributes']}"
-                        )
-                        self._tha_inventory[b["address"]]["attributes"].attrs = int(
-                            b["attributes"]
-                        )
+                else:
+                    _LOGGER.debug(f"Ignored method {tha_method} during setup.")
 
-                    elif tha_method in ["DeviceVersion"]:
-                        _LOGGER.debug(f"Address {b['address']} version {b['j_number']}")
-                        self._tha_inventory[b["address"]]["version"] = b["j_number"]
+            if None not in [
+                self._tha_fw_ver,
+                self._tha_pr_ver,
+                self._tha_setback_enable,
+            ]:
+                self._inSetup = False
 
-                    elif tha_method in ["SetbackEvents"]:
-                        _LOGGER.debug(
-                            f"Address {b['address']} setback events {b['events']}"
-                        )
-                        self._tha_inventory[b["address"]]["events"] = b["events"]
+        self.trace.end("gateway_info")
 
-                    else:
-                        _LOGGER.warning(f"Ignored method {tha_method} during setup.")
+        # the inventory goes first, ahead of the gateway state requests
+        self._tx_queue.append(
+            TrpcPacket(
+                service="Update",
+                method="ReportingState",
+                state=ThaValue.ON,
+            )
+        )
 
-                except KeyError as e:
-                    _LOGGER.debug(f"Ignored unknown key: {e}")
-                    pass
+        self.request_inventory()
 
-        else:
+        with self.trace.phase("gateway_device"):
             new_gateway = TekmarGateway(f"{self._id}", f"{self._host}", self)
             new_gateway.init_device()
-            self.tha_gateway = [
-                new_gateway,
-            ]
-
-            for address in self._tha_inventory:
-                if address in self.tha_ignore_addr:
-                    _LOGGER.debug(f"Ignored address {address} while creating devices.")
-                    continue
-
-                if (
-                    DEVICE_TYPES[self._tha_inventory[address]["type"]]
-                    == ThaType.THERMOSTAT
-                ):
-                    new_thermostat = TekmarThermostat(
-                        address, self._tha_inventory[address], self
-                    )
-                    await new_thermostat.init_device()
-                    self.tha_devices.append(new_thermostat)
-
-                elif (
-                    DEVICE_TYPES[self._tha_inventory[address]["type"]]
-                    == ThaType.SETPOINT
-                ):
-                    new_setpoint = TekmarSetpoint(
-                        address, self._tha_inventory[address], self
-                    )
-                    new_setpoint.init_device()
-                    self.tha_devices.append(new_setpoint)
-
-                elif (
-                    DEVICE_TYPES[self._tha_inventory[address]["type"]]
-                    == ThaType.SNOWMELT
-                ):
-                    new_snowmelt = TekmarSnowmelt(
-                        address, self._tha_inventory[address], self
-                    )
-                    new_snowmelt.init_device()
-                    self.tha_devices.append(new_snowmelt)
+        self.tha_gateway = [
+            new_gateway,
+        ]
 
-                else:
-                    _LOGGER.warning(f"Unknown device at address {address}")
+        if not self.online:
+            ir.async_delete_issue(self._hass, DOMAIN, "check_configuration")
+
+        self.online = True
 
-            if not self.online:
-                ir.async_delete_issue(self._hass, DOMAIN, "check_configuration")
+    async def _async_abort_setup(self, message: str) -> None:
+        """Close the setup connection and raise ConfigEntryNotReady.
 
-            self.online = True
+        Packet servers often accept a single client, so a connection left
+        open would block the next setup attempt.
+        """
+        self._inSetup = False
+        await self._sock.close()
+        raise ConfigEntryNotReady(message)
 
     async def run(self) -> None:
         self._inRun = True
-        readCycle = 0
+        self._last_rx = time.monotonic()
+        next_refresh = 0.0
+        reconnect_attempt = 0
 
         while self._inRun is True:
             try:
                 if not self._sock.is_open:
-                    readCycle = 0
                     if await self._sock.open() is False:
                         raise ConnectionError(f"Connection to {self._host} failed")
 
+                    self._last_rx = time.monotonic()
+                    self._heartbeat_sent = None
+                    self._inbound.clear()
+
                     # make sure reporting is on when we reconnect
                     self._tx_queue.append(
                         TrpcPacket(
@@ -342,209 +368,217 @@ class TekmarHub:
                         )
                     )
 
+                    # reports missed while offline are not replayed
+                    self.queue_resync()
+
+                    # devices may have been added or removed while offline
+                    self._reset_discovery()
+                    self.request_inventory()
+
                 if len(self._tx_queue) != 0:
-                    writePacket = self._tx_queue.pop(0)
-                    _LOGGER.debug(f"Run {writePacket}")
-                    await self._sock.write(writePacket)
-                    await asyncio.sleep(0.1)
+                    writePackets = self._pop_tx_burst()
+                elif self._refresh_queue and time.monotonic() >= next_refresh:
+                    next_refresh = time.monotonic() + REFRESH_SPACING
+                    writePackets = []
+                    while self._refresh_queue and len(writePackets) < self._tx_burst:
+                        key = self._refresh_queue.popleft()
+                        self._refresh_pending.discard(key)
+                        self._tha_last_request[key] = time.monotonic()
+                        writePackets.append(self._state_request(key))
+                else:
+                    writePackets = None
 
-                readCycle += 1
-                p = await self._sock.read()
+                if writePackets:
+                    for writePacket in writePackets:
+                        _LOGGER.debug(f"Run {writePacket}")
+                    await self._sock.write_many(writePackets)
+                    if self._tx_pace:
+                        await asyncio.sleep(self._tx_pace)
+
+                line = await self._async_read_line()
 
-                if readCycle > 130:
-                    raise ConnectionError(f"No reports from {self._host}")
+                if line is not None:
+                    self._last_rx = time.monotonic()
+                else:
+                    await self._async_heartbeat()
+
+                await self._async_check_liveness()
 
             except Exception as e:
-                _LOGGER.warning(f"Socket error: {e} - reconnecting.")
+                delay = backoff_delay(
+                    reconnect_attempt, RECONNECT_DELAY_BASE, RECONNECT_DELAY_MAX
+                )
+                reconnect_attempt += 1
+                _LOGGER.warning(
+                    f"Socket error: {e} - reconnecting in {delay:.1f} seconds."
+                )
                 await self._sock.close()
-                await asyncio.sleep(5)
+                await asyncio.sleep(delay)
+                line = None
+
+            if line is not None:
+                reconnect_attempt = 0
+                p = await self._async_decode(line)
+            else:
                 p = None
 
-            if p is not None:
-                readCycle = 0
+            if p is not None and self.trace.mark("first_report"):
+                _LOGGER.debug(f"First report {p}")
 
+            if p is not None:
                 try:
-                    h = p.header
-                    b = p.body
-                    tha_method = name_from_methodID[h["methodID"]]
+                    tha_method = p.method
 
                     _LOGGER.debug(f"Run {p}")
 
-                    if b["address"] in self.tha_ignore_addr:
-                        _LOGGER.debug(
-                            f"Ignored {tha_method} from address {b['address']}"
-                        )
+                    if p.address in self.tha_ignore_addr:
+                        _LOGGER.debug(f"Ignored {tha_method} from address {p.address}")
+                        continue
+
+                    if tha_method in [
+                        "DeviceType",
+                        "DeviceVersion",
+                        "DeviceAttributes",
+                        "DeviceInventory",
+                        "TakingAddress",
+                    ]:
+                        await self._async_inventory_report(tha_method, p)
                         continue
 
+                    if p.address > 0:
+                        if p.address not in self._tha_inventory:
+                            _LOGGER.info(
+                                f"{tha_method} from new device address "
+                                f"{p.address}, adding device."
+                            )
+                            self._discover_device(p.address)
+                            continue
+
+                        if p.address in self._tha_discovery:
+                            if tha_method in ["SetbackEvents"]:
+                                self._tha_inventory[p.address]["events"] = p.events
+                                self._state_updated(tha_method, p)
+                                continue
+
+                            _LOGGER.debug(
+                                f"Ignored {tha_method} from address {p.address} "
+                                "while adding device."
+                            )
+                            continue
+
+                    if p.address in self._tha_last_seen:
+                        await self._async_device_seen(p.address)
+
+                    self._state_updated(tha_method, p)
+
                     if tha_method in ["ReportingState"]:
                         for gateway in self.tha_gateway:
-                            await gateway.set_reporting_state(b["state"])
+                            await gateway.set_reporting_state(p.state)
 
                     elif tha_method in ["NetworkError"]:
                         for gateway in self.tha_gateway:
-                            await gateway.set_network_error(b["error"])
+                            await gateway.set_network_error(p.error)
 
                     elif tha_method in ["OutdoorTemperature"]:
                         for gateway in self.tha_gateway:
-                            await gateway.set_outdoor_temperature(p.body["temp"])
+                            await gateway.set_outdoor_temperature(p.temp)
 
                     elif tha_method in ["CurrentTemperature"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_current_temperature(p.body["temp"])
+                            if device.device_id == p.address:
+                                await device.set_current_temperature(p.temp)
 
                     elif tha_method in ["CurrentFloorTemperature"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_current_floor_temperature(
-                                    p.body["temp"]
-                                )
+                            if device.device_id == p.address:
+                                await device.set_current_floor_temperature(p.temp)
 
                     elif tha_method in ["HeatSetpoint"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                # await device.set_setback_state(p.body['setback'])
-                                await device.set_heat_setpoint(
-                                    p.body["setpoint"], p.body["setback"]
-                                )
+                            if device.device_id == p.address:
+                                # await device.set_setback_state(p.setback)
+                                await device.set_heat_setpoint(p.setpoint, p.setback)
 
                     elif tha_method in ["CoolSetpoint"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                # await device.set_setback_state(p.body['setback'])
-                                await device.set_cool_setpoint(
-                                    p.body["setpoint"], p.body["setback"]
-                                )
+                            if device.device_id == p.address:
+                                # await device.set_setback_state(p.setback)
+                                await device.set_cool_setpoint(p.setpoint, p.setback)
 
                     elif tha_method in ["SlabSetpoint"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                # await device.set_setback_state(p.body['setback'])
-                                await device.set_slab_setpoint(
-                                    p.body["setpoint"], p.body["setback"]
-                                )
+                            if device.device_id == p.address:
+                                # await device.set_setback_state(p.setback)
+                                await device.set_slab_setpoint(p.setpoint, p.setback)
 
                     elif tha_method in ["FanPercent"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_fan_percent(
-                                    p.body["percent"], p.body["setback"]
-                                )
+                            if device.device_id == p.address:
+                                await device.set_fan_percent(p.percent, p.setback)
 
                     elif tha_method in ["RelativeHumidity"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_relative_humidity(p.body["percent"])
+                            if device.device_id == p.address:
+                                await device.set_relative_humidity(p.percent)
 
                     elif tha_method in ["ActiveDemand"]:
-                        try:
-                            if (
-                                DEVICE_TYPES[self._tha_inventory[b["address"]]["type"]]
-                                == ThaType.THERMOSTAT
-                            ):
-                                self._tx_queue.append(
-                                    TrpcPacket(
-                                        service="Request",
-                                        method="ModeSetting",
-                                        address=b["address"],
-                                    )
-                                )
-                        except KeyError as e:
-                            _LOGGER.warning(
-                                (
-                                    f"Device address {e} not in inventory. "
-                                    "Reloading integration..."
-                                )
-                            )
-                            await self._hass.config_entries.async_reload(self._entry_id)
-
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_active_demand(p.body["demand"])
+                            if device.device_id == p.address:
+                                if device.profile.device_type == ThaType.THERMOSTAT:
+                                    self._tx_queue.append(
+                                        TrpcPacket(
+                                            service="Request",
+                                            method="ModeSetting",
+                                            address=p.address,
+                                        )
+                                    )
+                                await device.set_active_demand(p.demand)
 
                     elif tha_method in ["SetbackState"]:
-                        try:
-                            if self._tha_inventory[b["address"]][
-                                "attributes"
-                            ].FanPercent:
-                                self._tx_queue.append(
-                                    TrpcPacket(
-                                        service="Request",
-                                        method="FanPercent",
-                                        setback=ThaSetback.CURRENT,
-                                        address=b["address"],
+                        for device in self.tha_devices:
+                            if device.device_id == p.address:
+                                if device.profile.fan_percent:
+                                    self._tx_queue.append(
+                                        TrpcPacket(
+                                            service="Request",
+                                            method="FanPercent",
+                                            setback=ThaSetback.CURRENT,
+                                            address=p.address,
+                                        )
                                     )
-                                )
-                            for device in self.tha_devices:
-                                if device.device_id == b["address"]:
-                                    await device.set_setback_state(p.body["setback"])
-                        except KeyError as e:
-                            _LOGGER.warning(
-                                (
-                                    f"Device address {e} not in inventory. "
-                                    "Reloading integration..."
-                                )
-                            )
-                            await self._hass.config_entries.async_reload(self._entry_id)
+                                await device.set_setback_state(p.setback)
 
                     elif tha_method in ["SetbackEvents"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_setback_events(p.body["events"])
+                            if device.device_id == p.address:
+                                await device.set_setback_events(p.events)
 
                     elif tha_method in ["ModeSetting"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_mode_setting(p.body["mode"])
+                            if device.device_id == p.address:
+                                await device.set_mode_setting(p.mode)
 
                     elif tha_method in ["HumiditySetMin"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_humidity_setpoint_min(
-                                    p.body["percent"]
-                                )
+                            if device.device_id == p.address:
+                                await device.set_humidity_setpoint_min(p.percent)
 
                     elif tha_method in ["HumiditySetMax"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_humidity_setpoint_max(
-                                    p.body["percent"]
-                                )
+                            if device.device_id == p.address:
+                                await device.set_humidity_setpoint_max(p.percent)
 
                     elif tha_method in ["SetpointGroupEnable"]:
                         for gateway in self.tha_gateway:
-                            await gateway.set_setpoint_group(
-                                p.body["groupid"], p.body["enable"]
-                            )
+                            await gateway.set_setpoint_group(p.groupid, p.enable)
 
                     elif tha_method in ["SetpointDevice"]:
                         for device in self.tha_devices:
-                            if device.device_id == b["address"]:
-                                await device.set_setpoint_target(
-                                    p.body["temp"], p.body["setback"]
-                                )
-
-                    elif tha_method in ["TakingAddress"]:
-                        _LOGGER.warning(
-                            (
-                                f"Device at address {p.body['old_address']} moved to "
-                                f"{p.body['new_address']}. Reloading integration..."
-                            )
-                        )
-                        await self._hass.config_entries.async_reload(self._entry_id)
-
-                    elif tha_method in ["DeviceAttributes"]:
-                        _LOGGER.debug(
-                            f"Ignoring attributes from {b['address']} in run: "
-                            f"received {int(b['attributes'])} setup with "
-                            f"{self._tha_inventory[b['address']]['attributes'].attrs}"
-                        )
-
-                    elif tha_method in ["NullMethod"]:
-                        pass
+                            if device.device_id == p.address:
+                                await device.set_setpoint_target(p.temp, p.setback)
 
-                    elif tha_method in ["DateTime"]:
-                        pass
+                    elif tha_method in ["FirmwareRevision"]:
+                        self._heartbeat_received()
 
                     else:
                         _LOGGER.warning(f"Unhandeled method: {tha_method}")
@@ -553,6 +587,114 @@ class TekmarHub:
                     _LOGGER.debug(f"Ignored unknown key: {e}")
                     pass
 
+    async def _async_read_line(self) -> bytes | None:
+        """Return the next received line.
+
+        Everything the socket has received is moved to the inbound queue at
+        once, so a backlog of state reports is cut down to the latest report
+        of each value before any of it is processed.
+        """
+        if not self._inbound:
+            for rx_line in await self._sock.read_lines():
+                self._inbound.put(rx_line)
+
+        return self._inbound.get()
+
+    def _pop_tx_burst(self) -> list[TrpcPacket]:
+        """Take the packets to write in the next pacing slot."""
+        writePackets = self._tx_queue[: self._tx_burst]
+        del self._tx_queue[: self._tx_burst]
+        return writePackets
+
+    async def _async_heartbeat(self) -> None:
+        """Check the link when nothing has been received for a while.
+
+        After HEARTBEAT_IDLE seconds without a line a FirmwareRevision request
+        is sent. If nothing at all is received within HEARTBEAT_TIMEOUT after
+        that, the connection is considered dead. A quiet bus still answers the
+        heartbeat, so it never causes a reconnect.
+        """
+        now = time.monotonic()
+
+        if self._last_rx is None:
+            self._last_rx = now
+
+        if self._heartbeat_sent is not None and self._heartbeat_sent > self._last_rx:
+            if now - self._heartbeat_sent > HEARTBEAT_TIMEOUT:
+                raise ConnectionError(f"No heartbeat reply from {self._host}")
+
+        elif now - self._last_rx > HEARTBEAT_IDLE:
+            self._heartbeat_sent = now
+            await self._sock.write(
+                TrpcPacket(service="Request", method="FirmwareRevision")
+            )
+
+    def _heartbeat_received(self) -> None:
+        """Measure the round trip time of the outstanding heartbeat."""
+        if self._heartbeat_sent is not None:
+            self._rtt = time.monotonic() - self._heartbeat_sent
+            self._heartbeat_sent = None
+            _LOGGER.debug(f"Heartbeat round trip {self._rtt * 1000:.1f} ms")
+
+    async def _async_decode(self, line: bytes) -> TrpcPacket | None:
+        """Decode a received line, or return None if it would be discarded.
+
+        The decision is made from the fixed-offset header alone, so discarded
+        frames never have their body records built. State reports that no
+        entity is registered for still count as the device being seen.
+        """
+        header = peek_cached(line)
+
+        if (
+            header is None
+            or header[1] not in name_from_methodID
+            or header[1] in SKIP_METHOD_IDS
+            or header[2] in self.tha_ignore_addr
+        ):
+            self._skipped_decodes += 1
+            return None
+
+        tha_method = name_from_methodID[header[1]]
+
+        if (
+            tha_method in STATE_METHODS
+            and tha_method not in UNGATED_METHODS
+            and not self._subscribed(tha_method, header[2])
+        ):
+            if header[2] in self._tha_last_seen:
+                await self._async_device_seen(header[2])
+
+            self._skipped_decodes += 1
+            return None
+
+        return decode_cached(line)
+
+    def _subscribed(self, tha_method: str, address: int | None) -> bool:
+        """Return True if an entity uses reports of tha_method from address.
+
+        Reports without an address belong to the gateway. Devices that have no
+        entities registered yet, or are not known, are treated as subscribed so
+        nothing is lost while entities are being added.
+        """
+        if not address:
+            devices = self.tha_gateway
+        elif address in self._devices_by_address:
+            devices = [self._devices_by_address[address]]
+        else:
+            devices = []
+
+        for device in devices:
+            if device.subscribed(tha_method):
+                return True
+
+        if address and any(device.aggregated for device in devices):
+            for gateway in self.tha_gateway:
+                for aggregate in AGGREGATE_METHODS.get(tha_method, ()):
+                    if gateway.subscribed(aggregate):
+                        return True
+
+        return len(devices) == 0
+
     async def timekeeper(self, interval: int = 86400) -> None:
         while self._inRun is True:
             if not self._inReconnect:
@@ -571,29 +713,581 @@ class TekmarHub:
                 )
             await asyncio.sleep(interval)
 
+    async def refresher(self, interval: int = 30) -> None:
+        """Periodically queue requests for fields missing recent reports."""
+        while self._inRun is True:
+            await asyncio.sleep(interval)
+            if not self._inReconnect:
+                self.queue_refresh()
+
+    async def runtime_keeper(
+        self,
+        interval: int = RUNTIME_UPDATE_INTERVAL,
+        save_interval: int = RUNTIME_SAVE_INTERVAL,
+    ) -> None:
+        """Periodically publish zone runtimes and save them to storage.
+
+        A zone is published only when one of its shown runtimes or duty
+        cycles changed. The runtimes are also saved when the task is
+        cancelled.
+        """
+        saved = time.monotonic()
+
+        try:
+            while self._inRun is True:
+                await asyncio.sleep(interval)
+
+                now = time.time()
+                for device in self.tha_devices:
+                    if device.runtime.changed(now):
+                        await device.publish_change("DemandRuntime", True)
+
+                if time.monotonic() - saved >= save_interval:
+                    saved = time.monotonic()
+                    await self.save_runtime()
+
+        except asyncio.CancelledError:
+            await self.save_runtime()
+            raise
+
+    def demand_runtime(self, address: int) -> DemandRuntime:
+        """Return the runtime accumulator of a zone address.
+
+        It is restored if it was saved, and kept when the zone is removed, so
+        a zone added again at the same address continues its totals.
+        """
+        runtime = self._runtime.get(address)
+
+        if runtime is None:
+            stored = self._stored_runtime.pop(str(address), None)
+            if stored:
+                runtime = DemandRuntime.from_dict(stored)
+            else:
+                runtime = DemandRuntime()
+            self._runtime[address] = runtime
+
+        return runtime
+
+    async def save_runtime(self) -> None:
+        """Save the zone runtime accumulators to storage."""
+        if not self._runtime:
+            return
+
+        now = time.time()
+        data = dict(self._stored_runtime)
+
+        for address, runtime in self._runtime.items():
+            runtime.checkpoint(now)
+            data[str(address)] = runtime.as_dict()
+
+        await self.storage_put("runtime", data)
+
     async def async_queue_message(self, message: TrpcPacket) -> bool:
-        self._tx_queue.append(message)
+        self.queue_message(message)
         return True
 
     def queue_message(self, message: TrpcPacket) -> None:
         self._tx_queue.append(message)
+        self._state_requested(message)
+
+    def queue_resync(self, max_age: float | None = None) -> int:
+        """Queue requests for cached fields not reported within max_age seconds.
+
+        Used after a reconnect, when requests sent before the connection was
+        lost will never be answered. Returns the number of requests added.
+        """
+        if max_age is None:
+            max_age = self._resync_age
+
+        return self._queue_stale(lambda tha_method: max_age, True)
+
+    def queue_refresh(self) -> int:
+        """Queue requests for cached fields older than their refresh age.
+
+        Fields without an entry in STATE_REFRESH_AGE are never refreshed, and a
+        field is not requested again until its refresh age has passed since the
+        previous request. Returns the number of requests added.
+        """
+        return self._queue_stale(STATE_REFRESH_AGE.get, False)
+
+    def _queue_stale(self, max_age: Callable[[str], float | None], resync) -> int:
+        """Add stale cached fields to the refresh queue.
+
+        Refresh requests are sent only when the normal transmit queue is
+        empty, at most one burst every REFRESH_SPACING seconds, and a field
+        that is already queued is not queued again.
+        """
+        now = time.monotonic()
+        queued = {str(p) for p in self._tx_queue}
+        added = 0
+
+        for key, updated in self._tha_last_update.items():
+            age = max_age(key[0])
+            if age is None or now - updated < age or key in self._refresh_pending:
+                continue
+
+            if not resync and now - self._tha_last_request.get(key, 0) < age:
+                continue
+
+            if not self._subscribed(key[0], key[1]):
+                continue
+
+            if str(self._state_request(key)) in queued:
+                continue
+
+            self._refresh_queue.append(key)
+            self._refresh_pending.add(key)
+            added += 1
+
+        if added:
+            _LOGGER.debug(f"Queued {added} refresh requests")
+
+        return added
+
+    def _state_key(self, tha_method: str, body) -> tuple | None:
+        """Return the cache key for a state method, or None."""
+        try:
+            index_field = STATE_METHODS[tha_method]
+        except KeyError:
+            return None
+
+        if index_field is None:
+            index = None
+        else:
+            index = getattr(body, index_field)
+
+        return (tha_method, body.address, index)
+
+    def _state_updated(self, tha_method: str, body) -> None:
+        """Record when a cached field was last reported."""
+        key = self._state_key(tha_method, body)
+        if key is not None:
+            self._tha_last_update[key] = time.monotonic()
+
+    def _state_requested(self, message: TrpcPacket) -> None:
+        """Start tracking a cached field when it is first requested."""
+        if message.header["serviceID"] != serviceID_from_name["Request"]:
+            return
+
+        key = self._state_key(
+            name_from_methodID.get(message.header["methodID"]), message.message()
+        )
+
+        # setback CURRENT is reported back as the actual setback
+        if key is None or key[2] == ThaSetback.CURRENT:
+            return
+
+        now = time.monotonic()
+        self._tha_last_update.setdefault(key, now)
+        self._tha_last_request[key] = now
+
+    def _state_request(self, key: tuple) -> TrpcPacket:
+        """Build the request packet for a cached field."""
+        tha_method, address, index = key
+        request = {"service": "Request", "method": tha_method, "address": address}
+
+        index_field = STATE_METHODS[tha_method]
+        if index_field is not None:
+            request[index_field] = index
+
+        return TrpcPacket(**request)
+
+    def request_inventory(self) -> None:
+        """Request the device inventory to find added and removed devices."""
+        self._tha_inventory_seen = set()
+        self._tx_queue.append(
+            TrpcPacket(service="Request", method="DeviceInventory", address=0x0)
+        )
+
+    def _inventory_request(self, address: int) -> None:
+        """Create an inventory entry and request the device information."""
+        self._tha_inventory[address] = {
+            "entity": "",
+            "type": "",
+            "version": "",
+            "events": "",
+            "attributes": DeviceAttributes(),
+        }
+
+        for tha_method in [
+            "DeviceType",
+            "DeviceVersion",
+            "DeviceAttributes",
+            "SetbackEvents",
+        ]:
+            self._tx_queue.append(
+                TrpcPacket(service="Request", method=tha_method, address=address)
+            )
+
+    def _inventory_type(self, address: int, tha_type: int) -> None:
+        """Store the device type for an inventory address."""
+        try:
+            self._tha_inventory[address]["type"] = tha_type
+            self._tha_inventory[address]["entity"] = "{3} {0} {1} {2}".format(
+                DEVICE_TYPES[tha_type].capitalize(),
+                DEVICE_FEATURES[tha_type]["model"],
+                address,
+                self._name.capitalize(),
+            )
+            _LOGGER.debug(f"Address {address} type {tha_type}")
+
+        except KeyError:
+            _LOGGER.warning(
+                (
+                    f"Unknown device type {tha_type} at address "
+                    f"{address}. This address will be ignored."
+                )
+            )
+
+            self.tha_ignore_addr.append(address)
+
+    def _discover_device(self, address: int) -> None:
+        """Start adding a device that was not in the inventory.
+
+        A device that is still being added has its missing inventory replies
+        requested again, in case one was lost.
+        """
+        if address in self._tha_discovery:
+            self._retry_discovery(address)
+            return
+
+        if address in self._tha_inventory or address in self.tha_ignore_addr:
+            return
+
+        self._tha_discovery[address] = {
+            "DeviceType",
+            "DeviceVersion",
+            "DeviceAttributes",
+        }
+        self.trace.begin(f"inventory {address}", "inventory")
+        self._inventory_request(address)
+        self._liveness.schedule(address, time.monotonic() + DISCOVERY_TIMEOUT)
+
+    def _retry_discovery(self, address: int) -> None:
+        """Request the inventory replies still missing for a device."""
+        _LOGGER.debug(f"Requesting missing inventory of address {address} again.")
+
+        for tha_method in sorted(self._tha_discovery[address]):
+            self._tx_queue.append(
+                TrpcPacket(service="Request", method=tha_method, address=address)
+            )
+
+        self._liveness.schedule(address, time.monotonic() + DISCOVERY_TIMEOUT)
+
+    def _reset_discovery(self) -> None:
+        """Forget devices that were still being added, as after a reconnect.
+
+        Requests sent on the old connection will not be answered, so the
+        devices are discovered again from the next inventory.
+        """
+        for address in self._tha_discovery:
+            self._tha_inventory.pop(address, None)
+
+        self._tha_discovery.clear()
+
+    async def _async_inventory_report(self, tha_method: str, body) -> None:
+        """Handle inventory reports received after setup."""
+        address = body.address
+
+        if tha_method in ["DeviceInventory"]:
+            if address > 0:
+                if self._tha_inventory_seen is not None:
+                    self._tha_inventory_seen.add(address)
+                if address in self._tha_inventory_missing:
+                    self._tha_inventory_missing.discard(address)
+                    await self._async_device_seen(address)
+                self._discover_device(address)
+
+            elif self._tha_inventory_seen is not None:
+                await self._async_inventory_complete(self._tha_inventory_seen)
+                self._tha_inventory_seen = None
+                self._check_startup_complete()
+
+            return
+
+        if tha_method in ["TakingAddress"]:
+            _LOGGER.warning(
+                (
+                    f"Device at address {body.old_address} moved to "
+                    f"{body.new_address}."
+                )
+            )
+            await self.async_remove_device(body.old_address)
+            self._discover_device(body.new_address)
+            return
+
+        if address not in self._tha_discovery:
+            _LOGGER.debug(f"Ignoring {tha_method} from {address} in run.")
+            return
+
+        if tha_method in ["DeviceType"]:
+            self._inventory_type(address, body.type)
+
+            if address in self.tha_ignore_addr:
+                del self._tha_discovery[address]
+                del self._tha_inventory[address]
+                self.trace.end(f"inventory {address}")
+                self._check_startup_complete()
+                return
+
+        elif tha_method in ["DeviceVersion"]:
+            self._tha_inventory[address]["version"] = body.j_number
+
+        elif tha_method in ["DeviceAttributes"]:
+            self._tha_inventory[address]["attributes"] = body.attributes
+
+        self._tha_discovery[address].discard(tha_method)
+
+        if not self._tha_discovery[address]:
+            del self._tha_discovery[address]
+            self.trace.end(f"inventory {address}")
+
+            with self.trace.phase(f"init_device {address}", "devices"):
+                new_device = await self._create_device(address)
+            if new_device is not None:
+                self.tha_devices.append(new_device)
+                self._devices_by_address[address] = new_device
+                self._device_seen(address)
+                async_dispatcher_send(self._hass, self.signal_device_added, new_device)
+                self._startup_mark("first_entity")
+
+            self._check_startup_complete()
+
+    def _startup_mark(self, name: str) -> None:
+        """Record a startup milestone in the trace, once."""
+        if self.trace.mark(name):
+            _LOGGER.info(f"Startup {name} after {self.trace.marks[name]:.2f} seconds")
+
+    def _check_startup_complete(self) -> None:
+        """Mark startup complete when the first inventory has been added."""
+        if self._tha_inventory_seen is None and not self._tha_discovery:
+            self._startup_mark("all_entities")
+
+    async def _async_inventory_complete(self, seen: set[int]) -> None:
+        """Handle devices missing from a complete inventory.
+
+        A device missing once is marked offline, since a single inventory line
+        can be lost. It is removed only when the next complete inventory is
+        also missing it.
+        """
+        missing = set()
+
+        for device in list(self.tha_devices):
+            address = device.device_id
+            if address in seen:
+                continue
+
+            if address in self._tha_inventory_missing:
+                _LOGGER.warning(
+                    f"Device address {address} is no longer in "
+                    "the inventory, removing device."
+                )
+                await self.async_remove_device(address)
+                continue
+
+            _LOGGER.warning(f"Device address {address} is missing from the inventory.")
+            missing.add(address)
+            if address not in self._tha_offline:
+                self._tha_offline.add(address)
+                await device.set_online(False)
+
+        self._tha_inventory_missing = missing
+
+    async def _create_device(
+        self, address: int
+    ) -> "TekmarThermostat | TekmarSetpoint | TekmarSnowmelt | None":
+        """Create and initialize the device object for an inventory address."""
+        tha_device_type = DEVICE_TYPES[self._tha_inventory[address]["type"]]
+
+        if tha_device_type == ThaType.THERMOSTAT:
+            new_thermostat = TekmarThermostat(
+                address, self._tha_inventory[address], self
+            )
+            await new_thermostat.init_device()
+            return new_thermostat
+
+        elif tha_device_type == ThaType.SETPOINT:
+            new_setpoint = TekmarSetpoint(address, self._tha_inventory[address], self)
+            new_setpoint.init_device()
+            return new_setpoint
+
+        elif tha_device_type == ThaType.SNOWMELT:
+            new_snowmelt = TekmarSnowmelt(address, self._tha_inventory[address], self)
+            new_snowmelt.init_device()
+            return new_snowmelt
+
+        else:
+            _LOGGER.warning(f"Unknown device at address {address}")
+            return None
+
+    async def async_remove_device(self, address: int) -> None:
+        """Remove a device and its entities without reloading the integration."""
+        for device in self.tha_devices:
+            if device.device_id == address:
+                device.release()
+                device.runtime.update(None, time.time())
+
+        for gateway in self.tha_gateway:
+            for aggregates in AGGREGATE_FIELDS.values():
+                await gateway.update_aggregates(aggregates)
+
+        self.tha_devices = [
+            device for device in self.tha_devices if device.device_id != address
+        ]
+        self._devices_by_address.pop(address, None)
+        self._tha_inventory.pop(address, None)
+        self._tha_discovery.pop(address, None)
+
+        self._liveness.cancel(address)
+        self._tha_last_seen.pop(address, None)
+        self._tha_probed.discard(address)
+        self._tha_offline.discard(address)
+
+        for key in [key for key in self._tha_last_update if key[1] == address]:
+            del self._tha_last_update[key]
+            self._tha_last_request.pop(key, None)
+
+        device_registry = dr.async_get(self._hass)
+        device_entry = device_registry.async_get_device(identifiers={(DOMAIN, address)})
+
+        if device_entry is not None:
+            device_registry.async_update_device(
+                device_entry.id, remove_config_entry_id=self._entry_id
+            )
+
+    def _device_seen(self, address: int) -> None:
+        """Record that a device was heard from.
+
+        Only the timestamp is updated here. The device deadline on the timer
+        wheel is moved when it expires, so busy devices cost no timer updates.
+        """
+        self._tha_last_seen[address] = time.monotonic()
+
+        if address not in self._liveness:
+            self._liveness.schedule(
+                address, self._tha_last_seen[address] + self._device_timeout
+            )
+
+    async def _async_device_seen(self, address: int) -> None:
+        """Record that a device was heard from and bring it back online."""
+        self._device_seen(address)
+        self._tha_probed.discard(address)
+
+        if address in self._tha_offline:
+            self._tha_offline.discard(address)
+            _LOGGER.info(f"Device address {address} is back online.")
+            for device in self.tha_devices:
+                if device.device_id == address:
+                    await device.set_online(True)
+
+    async def _async_check_liveness(self) -> None:
+        """Probe silent devices and mark them offline if the probe is unanswered."""
+        now = time.monotonic()
+
+        for address in self._liveness.advance(now):
+            if address in self._tha_discovery:
+                self._retry_discovery(address)
+                continue
+
+            last_seen = self._tha_last_seen.get(address)
+            if last_seen is None:
+                continue
+
+            if now - last_seen < self._device_timeout:
+                self._liveness.schedule(address, last_seen + self._device_timeout)
+
+            elif address not in self._tha_probed:
+                _LOGGER.debug(f"No reports from device address {address}, probing.")
+                self._tha_probed.add(address)
+                self._tx_queue.append(
+                    TrpcPacket(
+                        service="Request", method="ActiveDemand", address=address
+                    )
+                )
+                self._liveness.schedule(address, now + PROBE_TIMEOUT)
+
+            else:
+                if address not in self._tha_offline:
+                    _LOGGER.warning(f"Device address {address} is not responding.")
+                    self._tha_offline.add(address)
+                    for device in self.tha_devices:
+                        if device.device_id == address:
+                            await device.set_online(False)
+
+                self._tha_probed.discard(address)
+                self._liveness.schedule(address, now + self._device_timeout)
+
+    def start(self, entry: ConfigEntry) -> None:
+        """Start the hub loops as background tasks of the config entry."""
+        for name, coro in [
+            ("run", self.run()),
+            ("timekeeper", self.timekeeper()),
+            ("refresher", self.refresher()),
+            ("runtime", self.runtime_keeper()),
+        ]:
+            self._tasks.append(
+                entry.async_create_background_task(
+                    self._hass, coro, f"{DOMAIN} {self._id} {name}"
+                )
+            )
+
+        # shutdown() only runs on unload, not when Home Assistant stops
+        entry.async_on_unload(
+            self._hass.bus.async_listen(
+                EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write
+            )
+        )
+
+    async def _async_final_write(self, event: Event) -> None:
+        await self.save_runtime()
 
     async def shutdown(self) -> None:
-        self._tx_queue = []
+        """Stop the hub loops and close the connection.
+
+        The loops are cancelled and awaited first, so nothing else writes to
+        the socket once shutdown returns.
+        """
         self._inRun = False
 
-        if await self._sock.open():
-            await self._sock.write(
-                TrpcPacket(
-                    service="Update", method="ReportingState", state=ThaValue.OFF
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self._tx_queue = []
+        self._refresh_queue.clear()
+        self._refresh_pending.clear()
+
+        if self._sock.is_open:
+            try:
+                await asyncio.wait_for(
+                    self._sock.write(
+                        TrpcPacket(
+                            service="Update",
+                            method="ReportingState",
+                            state=ThaValue.OFF,
+                        )
+                    ),
+                    timeout=SHUTDOWN_TIMEOUT,
                 )
-            )
-            await self._sock.close()
+
+            except (asyncio.TimeoutError, OSError) as e:
+                _LOGGER.debug(f"Could not turn off reporting: {e}")
+
+        try:
+            await asyncio.wait_for(self._sock.close(), timeout=SHUTDOWN_TIMEOUT)
+
+        except asyncio.TimeoutError:
+            _LOGGER.debug("Timed out closing connection to packet server.")
 
     @property
     def hub_id(self) -> str:
         return self._id
 
+    @property
+    def signal_device_added(self) -> str:
+        return SIGNAL_DEVICE_ADDED.format(self._entry_id)
+
     @property
     def online(self) -> bool:
         return self._online
@@ -617,6 +1311,45 @@ class TekmarHub:
     def tha_reporting_state(self) -> int:
         return self._tha_reporting_state
 
+    @property
+    def rtt(self) -> float | None:
+        """Round trip time of the last heartbeat in seconds."""
+        return self._rtt
+
+    @property
+    def decode_cache(self) -> dict[str, dict[str, int | float]]:
+        """Hit counts of the header and message decode caches."""
+        stats = {}
+
+        for name, cached in [("peek", peek_cached), ("decode", decode_cached)]:
+            info = cached.cache_info()
+            lookups = info.hits + info.misses
+            stats[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+                "maxsize": info.maxsize,
+                "hit_rate": round(info.hits / lookups, 3) if lookups else None,
+            }
+
+        return stats
+
+    @property
+    def conflated_reports(self) -> int:
+        return self._inbound.conflated
+
+    @property
+    def frame_parser(self) -> FrameParser:
+        return self._sock.parser
+
+    @property
+    def skipped_decodes(self) -> int:
+        return self._skipped_decodes
+
+    @property
+    def publish_interval(self) -> float | None:
+        return self._publish_interval
+
     @property
     def tha_setback_enable(self) -> bool:
         if self._tha_setback_enable:
@@ -631,23 +1364,141 @@ class TekmarHub:
         await self._storage.put_setting(key, value)
 
 
-class TekmarThermostat:
+class TekmarDevice:
+    """Base class for devices that entities register callbacks with."""
+
+    def __init__(self) -> None:
+        self._callbacks = {}
+        self._subscriptions = Counter()
+        self._published = {}
+        self._suppressed_updates = 0
+        self._online = True
+
+    def register_callback(
+        self, callback: Callable[[], None], methods: tuple[str, ...] | None = None
+    ) -> None:
+        """Register callback, called when a report for one of methods changes
+        the device state. If methods is None, callback is called for all
+        changes.
+        """
+        self.remove_callback(callback)
+        self._callbacks[callback] = methods
+        if methods is None:
+            self._subscriptions[None] += 1
+        else:
+            self._subscriptions.update(methods)
+
+    def remove_callback(self, callback: Callable[[], None]) -> None:
+        """Remove previously registered callback."""
+        if callback in self._callbacks:
+            methods = self._callbacks.pop(callback)
+            if methods is None:
+                self._subscriptions[None] -= 1
+            else:
+                self._subscriptions.subtract(methods)
+
+    def subscribed(self, tha_method: str) -> bool:
+        """Return True if a registered callback uses reports of tha_method, or
+        if no callbacks are registered yet.
+        """
+        if len(self._callbacks) == 0:
+            return True
+
+        return self._subscriptions[None] > 0 or self._subscriptions[tha_method] > 0
+
+    async def publish_updates(self, tha_method: str | None = None) -> None:
+        """Call the registered callbacks that use tha_method, or all callbacks
+        if tha_method is None.
+        """
+        for callback, methods in self._callbacks.items():
+            if tha_method is None or methods is None or tha_method in methods:
+                callback()
+
+    async def publish_change(self, tha_method: str, changed: bool) -> None:
+        """Publish a report of tha_method if it changed the device state.
+
+        Unchanged reports are counted and dropped, unless the hub's publish
+        interval has passed since tha_method was last published.
+        """
+        now = time.monotonic()
+        interval = self.hub.publish_interval
+
+        if not changed and (
+            interval is None or now - self._published.get(tha_method, now) < interval
+        ):
+            self._suppressed_updates += 1
+            return
+
+        self._published[tha_method] = now
+        await self.publish_updates(tha_method)
+
+    @property
+    def suppressed_updates(self) -> int:
+        return self._suppressed_updates
+
+    @property
+    def online(self) -> bool:
+        """Device is online."""
+        return self._online
+
+    async def set_online(self, online: bool) -> None:
+        self._online = online
+        await self.publish_updates()
+
+    @property
+    def device_info(self) -> Optional[Dict[str, Any]]:
+        return self._device_info
+
+
+class TekmarZone(TekmarDevice):
+    """Base class for zone devices, a view of their slot in the zone state."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._state = self.hub.zone_state
+
+        # only thermostats measure rooms, setpoint and snowmelt temperatures
+        # and demand are process values
+        self.aggregated = self.profile.device_type == ThaType.THERMOSTAT
+        self._slot = self._state.allocate(self.aggregated)
+        self.runtime = self.hub.demand_runtime(self._id)
+
+    def release(self) -> None:
+        """Give the zone state slot back when the device is removed."""
+        self._state.release(self._slot)
+
+    def _get(self, field: str, index: int = 0) -> int | None:
+        return self._state.get(self._slot, field, index)
+
+    async def _set(
+        self, tha_method: str, field: str, value: int | None, index: int = 0
+    ) -> None:
+        changed = self._state.set(self._slot, field, value, index)
+        await self.publish_change(tha_method, changed)
+
+        if changed and field == "active_demand":
+            now = time.time()
+            self.runtime.update(value, now)
+            if self.runtime.changed(now):
+                await self.publish_change("DemandRuntime", True)
+
+        if changed and self.aggregated and field in AGGREGATE_FIELDS:
+            for gateway in self.hub.tha_gateway:
+                await gateway.update_aggregates(AGGREGATE_FIELDS[field])
+
+
+class TekmarThermostat(TekmarZone):
     """Tekmar thermostat device."""
 
     def __init__(self, address: int, tha_device: [], hub: TekmarHub) -> None:
         self._id = address
         self.hub = hub
         self.tha_device = tha_device
-        self._callbacks = set()
-
-        self._tha_current_temperature = None  # degH
-        self._tha_current_floor_temperature = None  # degH
-        self._tha_active_demand = None
-        self._tha_relative_humidity = None
-        self._tha_setback_state = None
-        self._tha_mode_setting = None
-        self._tha_humidity_setpoint_min = None
-        self._tha_humidity_setpoint_max = None
+        self.profile = DeviceProfile.build(
+            tha_device["type"], tha_device["attributes"], hub.tha_pr_ver
+        )
+        super().__init__()
+
         self._config_vent_mode = None
         self._config_emergency_heat = None
         self._config_cooling = None
@@ -659,29 +1510,6 @@ class TekmarThermostat:
         self._config_slab_setpoint_max = None
         self._config_slab_setpoint_min = None
 
-        self._tha_heat_setpoints = {  # degE
-            0x00: None,  # day
-            0x01: None,  # night
-            0x02: None,  # away
-        }
-
-        self._tha_cool_setpoints = {  # degE
-            0x00: None,  # day
-            0x01: None,  # night
-            0x02: None,  # away
-        }
-
-        self._tha_slab_setpoints = {  # degE
-            0x00: None,  # day
-            0x01: None,  # night
-            0x02: None,  # away
-        }
-
-        self._tha_fan_percent = {  # degE
-            0x00: None,  # day
-            0x01: None,  # night
-        }
-
     async def init_device(self) -> None:
         self._config_vent_mode = await self.hub.storage_get(
             f"{self._id}_config_vent_mode"
@@ -705,10 +1533,10 @@ class TekmarThermostat:
         )
 
         # Some static information about this device
-        self._device_type = DEVICE_TYPES[self.tha_device["type"]]
+        self._device_type = self.profile.device_type
         self._tha_full_device_name = self.tha_device["entity"]
         self.firmware_version = str(self.tha_device["version"])
-        self.model = DEVICE_FEATURES[self.tha_device["type"]]["model"]
+        self.model = self.profile.model
 
         self._device_info = {
             "identifiers": {(DOMAIN, self._id)},
@@ -754,7 +1582,7 @@ class TekmarThermostat:
         )
 
         if self.setback_enable is True:
-            if self.tha_device["attributes"].ZoneCooling:
+            if self.profile.zone_cooling:
                 self.hub.queue_message(
                     TrpcPacket(
                         service="Request",
@@ -780,7 +1608,7 @@ class TekmarThermostat:
                     )
                 )
 
-            if self.tha_device["attributes"].ZoneHeating:
+            if self.profile.zone_heating:
                 self.hub.queue_message(
                     TrpcPacket(
                         service="Request",
@@ -807,7 +1635,7 @@ class TekmarThermostat:
                 )
 
         else:
-            if self.tha_device["attributes"].ZoneCooling:
+            if self.profile.zone_cooling:
                 self.hub.queue_message(
                     TrpcPacket(
                         service="Request",
@@ -817,7 +1645,7 @@ class TekmarThermostat:
                     )
                 )
 
-            if self.tha_device["attributes"].ZoneHeating:
+            if self.profile.zone_heating:
                 self.hub.queue_message(
                     TrpcPacket(
                         service="Request",
@@ -827,7 +1655,7 @@ class TekmarThermostat:
                     )
                 )
 
-        if self.tha_device["attributes"].FanPercent:
+        if self.profile.fan_percent:
             self.hub.queue_message(
                 TrpcPacket(
                     service="Request",
@@ -845,7 +1673,7 @@ class TekmarThermostat:
                 )
             )
 
-        if self.tha_device["attributes"].SlabSetpoint:
+        if self.profile.slab_setpoint:
             self.hub.queue_message(
                 TrpcPacket(
                     service="Request",
@@ -855,12 +1683,7 @@ class TekmarThermostat:
                 )
             )
 
-        if DEVICE_FEATURES[self.tha_device["type"]][
-            "humid"
-        ] and self.hub.tha_pr_ver in [
-            2,
-            3,
-        ]:
+        if self.profile.humidity:
             self.hub.queue_message(
                 TrpcPacket(
                     service="Request", method="RelativeHumidity", address=self._id
@@ -887,63 +1710,59 @@ class TekmarThermostat:
 
     @property
     def current_temperature(self) -> str:
-        return self._tha_current_temperature
+        return self._get("current_temperature")
 
     @property
     def current_floor_temperature(self) -> str:
-        if self.hub.tha_pr_ver not in [3]:
+        if not self.profile.floor_temperature:
             return None
         else:
-            return self._tha_current_floor_temperature
+            return self._get("current_floor_temperature")
 
     @property
     def relative_humidity(self) -> str:
-        if self.hub.tha_pr_ver not in [2, 3]:
+        if not self.profile.humidity:
             return None
         else:
-            return self._tha_relative_humidity
+            return self._get("relative_humidity")
 
     @property
     def cool_setpoint(self) -> str:
         try:
-            return self._tha_cool_setpoints[
-                SETBACK_SETPOINT_MAP[self._tha_setback_state]
-            ]
+            return self._get("cool_setpoint", SETBACK_SETPOINT_MAP[self.setback_state])
         except KeyError:
             return None
 
     @property
     def cool_setpoint_day(self) -> str:
-        return self._tha_cool_setpoints[0x00]
+        return self._get("cool_setpoint", 0x00)
 
     @property
     def cool_setpoint_night(self) -> str:
-        return self._tha_cool_setpoints[0x01]
+        return self._get("cool_setpoint", 0x01)
 
     @property
     def cool_setpoint_away(self) -> str:
-        return self._tha_cool_setpoints[0x02]
+        return self._get("cool_setpoint", 0x02)
 
     @property
     def heat_setpoint(self) -> str:
         try:
-            return self._tha_heat_setpoints[
-                SETBACK_SETPOINT_MAP[self._tha_setback_state]
-            ]
+            return self._get("heat_setpoint", SETBACK_SETPOINT_MAP[self.setback_state])
         except KeyError:
             return None
 
     @property
     def heat_setpoint_day(self) -> str:
-        return self._tha_heat_setpoints[0x00]
+        return self._get("heat_setpoint", 0x00)
 
     @property
     def heat_setpoint_night(self) -> str:
-        return self._tha_heat_setpoints[0x01]
+        return self._get("heat_setpoint", 0x01)
 
     @property
     def heat_setpoint_away(self) -> str:
-        return self._tha_heat_setpoints[0x02]
+        return self._get("heat_setpoint", 0x02)
 
     @property
     def config_vent_mode(self) -> bool:
@@ -994,15 +1813,13 @@ class TekmarThermostat:
     @property
     def slab_setpoint(self) -> str:
         try:
-            return self._tha_slab_setpoints[
-                SETBACK_SETPOINT_MAP[self._tha_setback_state]
-            ]
+            return self._get("slab_setpoint", SETBACK_SETPOINT_MAP[self.setback_state])
         except KeyError:
             return None
 
     @property
     def active_demand(self) -> str:
-        return self._tha_active_demand
+        return self._get("active_demand")
 
     @property
     def setback_enable(self) -> bool:
@@ -1010,7 +1827,7 @@ class TekmarThermostat:
 
     @property
     def setback_state(self) -> str:
-        return self._tha_setback_state
+        return self._get("setback_state")
 
     @property
     def setback_events(self) -> str:
@@ -1018,28 +1835,28 @@ class TekmarThermostat:
 
     @property
     def mode_setting(self) -> str:
-        return self._tha_mode_setting
+        return self._get("mode_setting")
 
     @property
     def fan_percent(self) -> str:
         try:
-            return self._tha_fan_percent[SETBACK_FAN_MAP[self.setback_state]]
+            return self._get("fan_percent", SETBACK_FAN_MAP[self.setback_state])
         except KeyError:
             return None
 
     @property
     def humidity_setpoint_min(self) -> str:
-        if self.hub.tha_pr_ver not in [2, 3]:
+        if not self.profile.humidity:
             return None
         else:
-            return self._tha_humidity_setpoint_min
+            return self._get("humidity_setpoint_min")
 
     @property
     def humidity_setpoint_max(self) -> str:
-        if self.hub.tha_pr_ver not in [2, 3]:
+        if not self.profile.humidity:
             return None
         else:
-            return self._tha_humidity_setpoint_max
+            return self._get("humidity_setpoint_max")
 
     async def set_config_vent_mode(self, value: bool) -> None:
         self._config_vent_mode = value
@@ -1047,20 +1864,21 @@ class TekmarThermostat:
         await self.publish_updates()
 
     async def set_current_temperature(self, temp: int) -> None:
-        self._tha_current_temperature = temp
-        await self.publish_updates()
+        await self._set("CurrentTemperature", "current_temperature", temp)
 
     async def set_current_floor_temperature(self, temp: int) -> None:
-        self._tha_current_floor_temperature = temp
-        await self.publish_updates()
+        await self._set("CurrentFloorTemperature", "current_floor_temperature", temp)
 
     async def set_relative_humidity(self, humidity: int) -> None:
-        self._tha_relative_humidity = humidity
-        await self.publish_updates()
+        await self._set("RelativeHumidity", "relative_humidity", humidity)
 
     async def set_heat_setpoint(self, setpoint: int, setback: int) -> None:
-        self._tha_heat_setpoints[SETBACK_SETPOINT_MAP[setback]] = setpoint
-        await self.publish_updates()
+        await self._set(
+            "HeatSetpoint",
+            "heat_setpoint",
+            setpoint,
+            SETBACK_SETPOINT_MAP[setback],
+        )
 
     async def set_heat_setpoint_txqueue(
         self, value: int, setback: int = ThaSetback.CURRENT
@@ -1076,8 +1894,12 @@ class TekmarThermostat:
         )
 
     async def set_cool_setpoint(self, setpoint: int, setback: int) -> None:
-        self._tha_cool_setpoints[SETBACK_SETPOINT_MAP[setback]] = setpoint
-        await self.publish_updates()
+        await self._set(
+            "CoolSetpoint",
+            "cool_setpoint",
+            setpoint,
+            SETBACK_SETPOINT_MAP[setback],
+        )
 
     async def set_cool_setpoint_txqueue(
         self, value: int, setback: int = ThaSetback.CURRENT
@@ -1093,8 +1915,12 @@ class TekmarThermostat:
         )
 
     async def set_slab_setpoint(self, setpoint: int, setback: int) -> None:
-        self._tha_slab_setpoints[SETBACK_SETPOINT_MAP[setback]] = setpoint
-        await self.publish_updates()
+        await self._set(
+            "SlabSetpoint",
+            "slab_setpoint",
+            setpoint,
+            SETBACK_SETPOINT_MAP[setback],
+        )
 
     async def set_slab_setpoint_txqueue(
         self, value: int, setback: int = ThaSetback.CURRENT
@@ -1110,8 +1936,7 @@ class TekmarThermostat:
         )
 
     async def set_fan_percent(self, percent: int, setback: int) -> None:
-        self._tha_fan_percent[SETBACK_FAN_MAP[setback]] = percent
-        await self.publish_updates()
+        await self._set("FanPercent", "fan_percent", percent, SETBACK_FAN_MAP[setback])
 
     async def set_fan_percent_txqueue(
         self, percent: int, setback: int = ThaSetback.CURRENT
@@ -1127,16 +1952,13 @@ class TekmarThermostat:
         )
 
     async def set_active_demand(self, demand: int) -> None:
-        self._tha_active_demand = demand
-        await self.publish_updates()
+        await self._set("ActiveDemand", "active_demand", demand)
 
     async def set_setback_state(self, setback: int) -> None:
-        self._tha_setback_state = setback
-        await self.publish_updates()
+        await self._set("SetbackState", "setback_state", setback)
 
     async def set_mode_setting(self, mode: int) -> None:
-        self._tha_mode_setting = mode
-        await self.publish_updates()
+        await self._set("ModeSetting", "mode_setting", mode)
 
     async def set_mode_setting_txqueue(self, value: int) -> None:
         await self.hub.async_queue_message(
@@ -1146,8 +1968,7 @@ class TekmarThermostat:
         )
 
     async def set_humidity_setpoint_min(self, percent: int) -> None:
-        self._tha_humidity_setpoint_min = percent
-        await self.publish_updates()
+        await self._set("HumiditySetMin", "humidity_setpoint_min", percent)
 
     async def set_humidity_setpoint_min_txqueue(self, value: int) -> None:
         await self.hub.async_queue_message(
@@ -1160,8 +1981,7 @@ class TekmarThermostat:
         )
 
     async def set_humidity_setpoint_max(self, percent: int) -> None:
-        self._tha_humidity_setpoint_max = percent
-        await self.publish_updates()
+        await self._set("HumiditySetMax", "humidity_setpoint_max", percent)
 
     async def set_humidity_setpoint_max_txqueue(self, value: int) -> None:
         await self.hub.async_queue_message(
@@ -1174,52 +1994,28 @@ class TekmarThermostat:
         )
 
     async def set_setback_events(self, events: int) -> None:
+        changed = events != self.tha_device["events"]
         self.tha_device["events"] = events
-        await self.publish_updates()
+        await self.publish_change("SetbackEvents", changed)
 
-    def register_callback(self, callback: Callable[[], None]) -> None:
-        """Register callback, called when TekmarThermostat changes state."""
-        self._callbacks.add(callback)
 
-    def remove_callback(self, callback: Callable[[], None]) -> None:
-        """Remove previously registered callback."""
-        self._callbacks.discard(callback)
-
-    async def publish_updates(self) -> None:
-        """Schedule call all registered callbacks."""
-        for callback in self._callbacks:
-            callback()
-
-    @property
-    def online(self) -> float:
-        """Device is online."""
-        return True
-
-    @property
-    def device_info(self) -> Optional[Dict[str, Any]]:
-        return self._device_info
-
-
-class TekmarSetpoint:
+class TekmarSetpoint(TekmarZone):
     """Tekmar setpoint device."""
 
     def __init__(self, address: int, tha_device: [], hub: TekmarHub) -> None:
         self._id = address
         self.hub = hub
         self.tha_device = tha_device
-        self._callbacks = set()
-
-        self._tha_current_temperature = None  # degH
-        self._tha_current_floor_temperature = None  # degH
-        self._tha_setpoint_target_temperature = None  # degH
-        self._tha_active_demand = None
-        self._tha_setback_state = None
+        self.profile = DeviceProfile.build(
+            tha_device["type"], tha_device["attributes"], hub.tha_pr_ver
+        )
+        super().__init__()
 
         # Some static information about this device
-        self._device_type = DEVICE_TYPES[self.tha_device["type"]]
+        self._device_type = self.profile.device_type
         self._tha_full_device_name = self.tha_device["entity"]
         self.firmware_version = str(self.tha_device["version"])
-        self.model = DEVICE_FEATURES[self.tha_device["type"]]["model"]
+        self.model = self.profile.model
 
         self._device_info = {
             "identifiers": {(DOMAIN, self._id)},
@@ -1288,18 +2084,18 @@ class TekmarSetpoint:
 
     @property
     def current_temperature(self) -> str:
-        return self._tha_current_temperature
+        return self._get("current_temperature")
 
     @property
     def current_floor_temperature(self) -> str:
-        if self.hub.tha_pr_ver not in [3]:
+        if not self.profile.floor_temperature:
             return None
         else:
-            return self._tha_current_floor_temperature
+            return self._get("current_floor_temperature")
 
     @property
     def setpoint_target(self) -> str:
-        return self._tha_setpoint_target_temperature
+        return self._get("setpoint_target")
 
     @property
     def setback_enable(self) -> bool:
@@ -1307,68 +2103,45 @@ class TekmarSetpoint:
 
     @property
     def setback_state(self) -> str:
-        return self._tha_setback_state
+        return self._get("setback_state")
 
     @property
     def active_demand(self) -> str:
-        return self._tha_active_demand
+        return self._get("active_demand")
 
     async def set_current_temperature(self, temp: int) -> None:
-        self._tha_current_temperature = temp
-        await self.publish_updates()
+        await self._set("CurrentTemperature", "current_temperature", temp)
 
     async def set_current_floor_temperature(self, temp: int) -> None:
-        self._tha_current_floor_temperature = temp
-        await self.publish_updates()
+        await self._set("CurrentFloorTemperature", "current_floor_temperature", temp)
 
     async def set_setpoint_target(self, temp: int, setback: int) -> None:
-        self._tha_setpoint_target_temperature = temp
-        await self.publish_updates()
+        await self._set("SetpointDevice", "setpoint_target", temp)
 
     async def set_active_demand(self, demand: int) -> None:
-        self._tha_active_demand = demand
-        await self.publish_updates()
+        await self._set("ActiveDemand", "active_demand", demand)
 
     async def set_setback_state(self, setback: int) -> None:
-        self._tha_setback_state = setback
-        await self.publish_updates()
+        await self._set("SetbackState", "setback_state", setback)
 
-    def register_callback(self, callback: Callable[[], None]) -> None:
-        self._callbacks.add(callback)
-
-    def remove_callback(self, callback: Callable[[], None]) -> None:
-        self._callbacks.discard(callback)
-
-    async def publish_updates(self) -> None:
-        for callback in self._callbacks:
-            callback()
-
-    @property
-    def online(self) -> float:
-        """Device is online."""
-        return True
-
-    @property
-    def device_info(self) -> Optional[Dict[str, Any]]:
-        return self._device_info
 
-
-class TekmarSnowmelt:
+class TekmarSnowmelt(TekmarZone):
     """Temkar snowmelt device."""
 
     def __init__(self, address: int, tha_device: [], hub: TekmarHub) -> None:
         self._id = address
         self.hub = hub
         self.tha_device = tha_device
-        self._callbacks = set()
-
-        self._tha_active_demand = None
+        self.profile = DeviceProfile.build(
+            tha_device["type"], tha_device["attributes"], hub.tha_pr_ver
+        )
+        super().__init__()
 
         # Some static information about this device
-        self._device_type = DEVICE_TYPES[self.tha_device["type"]]
+        self._device_type = self.profile.device_type
         self._tha_full_device_name = self.tha_device["entity"]
         self.firmware_version = str(self.tha_device["version"])
-        self.model = DEVICE_FEATURES[self.tha_device["type"]]["model"]
+        self.model = self.profile.model
 
         self._device_info = {
             "identifiers": {(DOMAIN, self._id)},
@@ -1398,43 +2171,24 @@ class TekmarSnowmelt:
 
     @property
     def active_demand(self) -> str:
-        return self._tha_active_demand
+        return self._get("active_demand")
 
     async def set_active_demand(self, demand: int) -> None:
-        self._tha_active_demand = demand
-        await self.publish_updates()
-
-    def register_callback(self, callback: Callable[[], None]) -> None:
-        self._callbacks.add(callback)
-
-    def remove_callback(self, callback: Callable[[], None]) -> None:
-        self._callbacks.discard(callback)
-
-    async def publish_updates(self) -> None:
-        for callback in self._callbacks:
-            callback()
-
-    @property
-    def online(self) -> float:
-        """Device is online."""
-        return True
-
-    @property
-    def device_info(self) -> Optional[Dict[str, Any]]:
-        return self._device_info
+        await self._set("ActiveDemand", "active_demand", demand)
 
 
-class TekmarGateway:
+class TekmarGateway(TekmarDevice):
     """Tekmar 482 Gateway device."""
 
     def __init__(self, gatewayid: str, host: str, hub: TekmarHub) -> None:
         self._id = gatewayid
         self._host = host
         self.hub = hub
-        self._callbacks = set()
+        super().__init__()
 
         self._tha_network_error = 0x0
         self._tha_outdoor_temperature = None
+        self._aggregates = {}
         self._tha_setpoint_groups = {
             1: None,
             2: None,
@@ -1453,6 +2207,7 @@ class TekmarGateway:
         # Some static information about this device
         self.firmware_version = f"{self.hub.tha_fw_ver} protocol {self.hub.tha_pr_ver}"
         self.model = "482"
+        self.has_setpoint_groups = self.hub.tha_pr_ver in [2, 3]
 
         self._device_info = {
             "identifiers": {(DOMAIN, self.hub.hub_id)},
@@ -1467,6 +2222,9 @@ class TekmarGateway:
             TrpcPacket(service="Request", method="OutdoorTemperature")
         )
 
+        if not self.has_setpoint_groups:
+            return
+
         for group in range(1, 13):
             self.hub.queue_message(
                 TrpcPacket(
@@ -1483,21 +2241,25 @@ class TekmarGateway:
         return self._host
 
     async def set_reporting_state(self, state: int) -> None:
+        changed = state != self.hub._tha_reporting_state
         self.hub._tha_reporting_state = state
-        await self.publish_updates()
+        await self.publish_change("ReportingState", changed)
 
     async def set_outdoor_temperature(self, temp: int) -> None:
+        changed = temp != self._tha_outdoor_temperature
         self._tha_outdoor_temperature = temp
-        await self.publish_updates()
+        await self.publish_change("OutdoorTemperature", changed)
 
     async def set_network_error(self, neterr: int) -> None:
+        changed = neterr != self._tha_network_error
         self._tha_network_error = neterr
-        await self.publish_updates()
+        await self.publish_change("NetworkError", changed)
 
     async def set_setpoint_group(self, group: int, value: int) -> None:
         if group in list(range(1, 13)):
+            changed = value != self._tha_setpoint_groups[group]
             self._tha_setpoint_groups[group] = value
-            await self.publish_updates()
+            await self.publish_change("SetpointGroupEnable", changed)
 
     async def set_setpoint_group_txqueue(self, group: int, value: bool) -> None:
         await self.hub.async_queue_message(
@@ -1509,24 +2271,6 @@ class TekmarGateway:
             )
         )
 
-    def register_callback(self, callback: Callable[[], None]) -> None:
-        """Register callback, called when TekmarGateway changes state."""
-        self._callbacks.add(callback)
-
-    def remove_callback(self, callback: Callable[[], None]) -> None:
-        """Remove previously registered callback."""
-        self._callbacks.discard(callback)
-
-    async def publish_updates(self) -> None:
-        """Schedule call all registered callbacks."""
-        for callback in self._callbacks:
-            callback()
-
-    @property
-    def online(self) -> float:
-        """Device is online."""
-        return True
-
     @property
     def reporting_state(self) -> int:
         return self.hub.tha_reporting_state
@@ -1548,8 +2292,30 @@ class TekmarGateway:
         return self._tha_setpoint_groups
 
     @property
-    def device_info(self) -> Optional[Dict[str, Any]]:
-        return self._device_info
+    def zones_calling_for_heat(self) -> int:
+        return self.hub.zone_state.count("active_demand", ThaActiveDemand.HEAT)
+
+    @property
+    def zone_temperature_average(self) -> float | None:
+        return self.hub.zone_state.mean("current_temperature")
+
+    @property
+    def zone_temperature_minimum(self) -> int | None:
+        return self.hub.zone_state.minimum("current_temperature")
+
+    async def update_aggregates(self, aggregates: tuple[str, ...]) -> None:
+        """Publish the zone aggregates that changed after a zone update."""
+        for aggregate in aggregates:
+            if aggregate == "ZonesCallingForHeat":
+                value = self.zones_calling_for_heat
+            elif aggregate == "ZoneTemperatureAverage":
+                value = self.zone_temperature_average
+            else:
+                value = self.zone_temperature_minimum
+
+            if value != self._aggregates.get(aggregate):
+                self._aggregates[aggregate] = value
+                await self.publish_change(aggregate, True)
 
 
 class StoredData(object):
@@ -1568,16 +2334,16 @@ class StoredData(object):
 
     async def get_setting(self, key: str) -> Any:
         if self._data is None:
-            self._data = await self.store.async_load()
+            self._data = await self.store.async_load() or {}
 
-        return self._data.get(self._entry_id).get(key)
+        return self._data.get(self._entry_id, {}).get(key)
 
     async def put_setting(self, key: str, value: Any) -> None:
         self._data = await self.store.async_load()
         if self._data is None:
             self._data = {}
 
-        self._data.update([(self._entry_id, {key: value})])
+        self._data.setdefault(self._entry_id, {})[key] = value
         await self.store.async_save(self._data)
 
 
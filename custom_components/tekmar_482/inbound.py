@@ -0,0 +1,68 @@
+"""Inbound line queue for Tekmar Gateway 482."""
+
+from __future__ import annotations
+
+from collections import deque
+
+from .protocol import line_key_ends
+
+
+class InboundQueue:
+    """Received lines waiting to be processed, latest value wins.
+
+    A line is keyed by its service, method ID and the leading body bytes that
+    say which value it carries, such as the address and setback. When a line
+    arrives for a key that is still queued, the queued one is dropped and the
+    new one goes to the end. Lines of methods without a key length are never
+    dropped and keep their order.
+    """
+
+    def __init__(self, key_lengths: dict[int, int]) -> None:
+        """key_lengths maps a method ID to the number of body bytes in a key."""
+        self._key_lengths = line_key_ends(key_lengths)
+        self._queue = deque()
+        self._latest = {}
+        self._seq = 0
+        self._len = 0
+
+        self.conflated = 0
+
+    def __len__(self) -> int:
+        return self._len
+
+    def put(self, line: bytes) -> None:
+        """Queue a line, replacing a queued line with the same key."""
+        self._seq += 1
+
+        key_length = self._key_lengths.get(line[4:12])
+        if key_length is None or len(line) < key_length:
+            key = None
+        else:
+            key = line[:key_length]
+            if key in self._latest:
+                self.conflated += 1
+                self._len -= 1
+            self._latest[key] = self._seq
+
+        self._queue.append((self._seq, key, line))
+        self._len += 1
+
+    def get(self) -> bytes | None:
+        """Return the oldest queued line, or None if the queue is empty."""
+        while self._queue:
+            seq, key, line = self._queue.popleft()
+
+            if key is not None:
+                if self._latest[key] != seq:
+                    continue
+                del self._latest[key]
+
+            self._len -= 1
+            return line
+
+        return None
+
+    def clear(self) -> None:
+        self._queue.clear()
+        self._latest.clear()
+        self._len = 0
@@ -5,10 +5,11 @@ from __future__ import annotations
 from homeassistant.components.number import NumberDeviceClass, NumberEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DEVICE_FEATURES, DEVICE_TYPES, DOMAIN, ThaType, ThaValue
+from .const import DOMAIN, ThaType, ThaValue
 from .helpers import degCtoE, degEtoC
 
 
@@ -22,31 +23,56 @@ async def async_setup_entry(
     entities = []
 
     for device in hub.tha_devices:
-        if DEVICE_TYPES[device.tha_device["type"]] == ThaType.THERMOSTAT:
-            if hub.tha_setback_enable is True:
+        entities.extend(_device_entities(hub, device, config_entry))
+
+    if entities:
+        async_add_entities(entities)
+
+    @callback
+    def async_add_device(device) -> None:
+        async_add_entities(_device_entities(hub, device, config_entry))
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, hub.signal_device_added, async_add_device)
+    )
+
+
+def _device_entities(hub, device, config_entry) -> list[NumberEntity]:
+    """Create the number entities for a device."""
+    entities = []
+
+    if device.profile.device_type == ThaType.THERMOSTAT:
+        profile = device.profile
+
+        if hub.tha_setback_enable is True:
+            if profile.zone_heating:
                 entities.append(ThaHeatSetpointDay(device, config_entry))
                 entities.append(ThaHeatSetpointNight(device, config_entry))
                 entities.append(ThaHeatSetpointAway(device, config_entry))
+            if profile.zone_cooling:
                 entities.append(ThaCoolSetpointDay(device, config_entry))
                 entities.append(ThaCoolSetpointNight(device, config_entry))
                 entities.append(ThaCoolSetpointAway(device, config_entry))
 
-            else:
+        else:
+            if profile.zone_heating:
                 entities.append(ThaHeatSetpoint(device, config_entry))
+            if profile.zone_cooling:
                 entities.append(ThaCoolSetpoint(device, config_entry))
+            if profile.slab_setpoint:
                 entities.append(ThaSlabSetpoint(device, config_entry))
 
-            if DEVICE_FEATURES[device.tha_device["type"]]["humid"]:
-                entities.append(ThaHumiditySetMax(device, config_entry))
-                entities.append(ThaHumiditySetMin(device, config_entry))
+        if profile.humidity:
+            entities.append(ThaHumiditySetMax(device, config_entry))
+            entities.append(ThaHumiditySetMin(device, config_entry))
 
-    if entities:
-        async_add_entities(entities)
+    return entities
 
 
 class ThaNumberBase(NumberEntity):
     """Base class for Tekmar number entities."""
 
+    tha_methods = None
     should_poll = False
 
     def __init__(self, tekmar_tha, config_entry):
@@ -70,7 +96,7 @@ class ThaNumberBase(NumberEntity):
         return self._config_entry.data["name"]
 
     async def async_added_to_hass(self):
-        self._tekmar_tha.register_callback(self.async_write_ha_state)
+        self._tekmar_tha.register_callback(self.async_write_ha_state, self.tha_methods)
 
     async def async_will_remove_from_hass(self):
         self._tekmar_tha.remove_callback(self.async_write_ha_state)
@@ -79,6 +105,8 @@ class ThaNumberBase(NumberEntity):
 class ThaHumiditySetMax(ThaNumberBase):
     """Maximum humidity setpoint for a Tekmar thermostat."""
 
+    tha_methods = ("HumiditySetMin", "HumiditySetMax")
+
     native_unit_of_measurement = PERCENTAGE
     icon = "mdi:water-percent"
     native_min_value = 20
@@ -125,6 +153,8 @@ class ThaHumiditySetMax(ThaNumberBase):
 class ThaHumiditySetMin(ThaNumberBase):
     """Minimum humidity setpoint for a Tekmar thermostat."""
 
+    tha_methods = ("HumiditySetMin", "HumiditySetMax")
+
     native_unit_of_measurement = PERCENTAGE
     icon = "mdi:water-percent"
     native_min_value = 20
@@ -171,6 +201,8 @@ class ThaHumiditySetMin(ThaNumberBase):
 class ThaHeatSetpoint(ThaNumberBase):
     """Heating setpoint for a Tekmar thermostat."""
 
+    tha_methods = ("HeatSetpoint", "SetbackState")
+
     device_class = NumberDeviceClass.TEMPERATURE
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
     icon = "mdi:thermostat"
@@ -195,10 +227,7 @@ class ThaHeatSetpoint(ThaNumberBase):
 
     @property
     def available(self) -> bool:
-        if self._tekmar_tha.heat_setpoint == ThaValue.NA_8:
-            return False
-
-        elif self._tekmar_tha.tha_device["attributes"].ZoneHeating == 0:
+        if self._tekmar_tha.heat_setpoint is None:
             return False
 
         else:
@@ -240,10 +269,7 @@ class ThaHeatSetpointDay(ThaHeatSetpoint):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.heat_setpoint_day == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneHeating == 0
-        ):
+        if self._tekmar_tha.heat_setpoint_day is None:
             return False
 
         return super().available
@@ -276,10 +302,7 @@ class ThaHeatSetpointNight(ThaHeatSetpoint):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.heat_setpoint_day == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneHeating == 0
-        ):
+        if self._tekmar_tha.heat_setpoint_day is None:
             return False
 
         return super().available
@@ -312,10 +335,7 @@ class ThaHeatSetpointAway(ThaHeatSetpoint):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.heat_setpoint_day == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneHeating == 0
-        ):
+        if self._tekmar_tha.heat_setpoint_day is None:
             return False
 
         return super().available
@@ -335,6 +355,8 @@ class ThaHeatSetpointAway(ThaHeatSetpoint):
 class ThaCoolSetpoint(ThaNumberBase):
     """Cooling setpoint for a Tekmar thermostat."""
 
+    tha_methods = ("CoolSetpoint", "SetbackState")
+
     device_class = NumberDeviceClass.TEMPERATURE
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
     icon = "mdi:thermostat"
@@ -359,10 +381,7 @@ class ThaCoolSetpoint(ThaNumberBase):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.cool_setpoint == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneCooling == 0
-        ):
+        if self._tekmar_tha.cool_setpoint is None:
             return False
 
         return super().available
@@ -403,10 +422,7 @@ class ThaCoolSetpointDay(ThaCoolSetpoint):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.cool_setpoint_day == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneCooling == 0
-        ):
+        if self._tekmar_tha.cool_setpoint_day is None:
             return False
 
         return super().available
@@ -439,10 +455,7 @@ class ThaCoolSetpointNight(ThaCoolSetpoint):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.cool_setpoint_day == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneCooling == 0
-        ):
+        if self._tekmar_tha.cool_setpoint_day is None:
             return False
 
         return super().available
@@ -475,10 +488,7 @@ class ThaCoolSetpointAway(ThaCoolSetpoint):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.cool_setpoint_day == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].ZoneCooling == 0
-        ):
+        if self._tekmar_tha.cool_setpoint_day is None:
             return False
 
         return super().available
@@ -496,6 +506,8 @@ class ThaCoolSetpointAway(ThaCoolSetpoint):
 
 
 class ThaSlabSetpoint(ThaNumberBase):
+    tha_methods = ("SlabSetpoint", "SetbackState")
+
     device_class = NumberDeviceClass.TEMPERATURE
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
     icon = "mdi:thermostat"
@@ -513,11 +525,7 @@ class ThaSlabSetpoint(ThaNumberBase):
 
     @property
     def available(self) -> bool:
-        return self._tekmar_tha.slab_setpoint != ThaValue.NA_8 and super().available
-
-    @property
-    def entity_registry_enabled_default(self) -> bool:
-        return self._tekmar_tha.tha_device["attributes"].SlabSetpoint
+        return self._tekmar_tha.slab_setpoint is not None and super().available
 
     @property
     def native_value(self):
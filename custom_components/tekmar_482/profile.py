@@ -0,0 +1,57 @@
+"""Device capability profiles for Tekmar Gateway 482."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from .const import DEVICE_FEATURES, DEVICE_TYPES, DeviceAttributes, ThaType
+
+# thermostats that take fan percent in steps of 10 (1 = 10%)
+FAN_STEP_TYPES = [99201, 99202, 99203]
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceProfile:
+    """What a device supports, built once when the device is created.
+
+    Combines the device type table, the attributes reported by the device
+    and the gateway protocol version, so entities read plain attributes.
+    """
+
+    tha_type: int
+    device_type: ThaType
+    model: str
+    zone_heating: bool
+    zone_cooling: bool
+    slab_setpoint: bool
+    fan_percent: bool
+    fan: bool
+    emergency_heat: bool
+    humidity: bool
+    floor_temperature: bool
+    fan_steps: bool
+
+    @classmethod
+    def build(
+        cls, tha_type: int, attributes: DeviceAttributes, pr_ver: int | None
+    ) -> DeviceProfile:
+        features = DEVICE_FEATURES[tha_type]
+
+        return cls(
+            tha_type=tha_type,
+            device_type=DEVICE_TYPES[tha_type],
+            model=features["model"],
+            zone_heating=bool(attributes.ZoneHeating),
+            zone_cooling=bool(attributes.ZoneCooling),
+            slab_setpoint=bool(attributes.SlabSetpoint),
+            fan_percent=bool(attributes.FanPercent),
+            fan=bool(features["fan"]),
+            emergency_heat=bool(features["emer"]),
+            humidity=bool(features["humid"]) and pr_ver in [2, 3],
+            floor_temperature=pr_ver in [3],
+            fan_steps=tha_type in FAN_STEP_TYPES,
+        )
+
+    @property
+    def heat_cool(self) -> bool:
+        return self.zone_heating and self.zone_cooling
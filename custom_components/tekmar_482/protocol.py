@@ -0,0 +1,61 @@
+"""tHA line keys shared by the integration and the standalone engine.
+
+This module, and the modules it imports, do not use Home Assistant.
+"""
+
+from __future__ import annotations
+
+from .const import STATE_METHODS
+from .trpc_msg import method_formats, methodID_from_name
+
+# methods the engine also forwards only when their value changed
+ENGINE_VALUE_METHODS = (
+    "NetworkError",
+    "ReportingState",
+    "DeviceAttributes",
+    "SetbackEnable",
+)
+
+
+def key_length(tha_method: str) -> int:
+    """Return the number of body bytes that identify the value of a method.
+
+    These are the address and index fields, which lead the body.
+    """
+    key_fields = {"address", STATE_METHODS.get(tha_method)}
+    length = 0
+
+    for field in method_formats[methodID_from_name[tha_method]].fields:
+        if field.name not in key_fields:
+            break
+        length += field.size
+
+    return length
+
+
+def line_key_ends(key_lengths: dict[int, int]) -> dict[bytes, int]:
+    """Map the hex method ID of a line to the end of its key fields.
+
+    key_lengths maps a method ID to the number of body bytes in a key. The
+    method ID is found at line[4:12].
+    """
+    return {
+        method_id.to_bytes(4, "little").hex().upper().encode(): 12 + 2 * length
+        for method_id, length in key_lengths.items()
+    }
+
+
+# state reports only the latest of which matters when processing falls behind
+CONFLATE_KEY_LENGTHS = {
+    methodID_from_name[tha_method]: key_length(tha_method)
+    for tha_method in STATE_METHODS
+}
+
+# reports the engine forwards only when their value changed
+VALUE_KEY_LENGTHS = {
+    **CONFLATE_KEY_LENGTHS,
+    **{
+        methodID_from_name[tha_method]: key_length(tha_method)
+        for tha_method in ENGINE_VALUE_METHODS
+    },
+}
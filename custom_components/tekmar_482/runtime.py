@@ -0,0 +1,176 @@
+"""Demand runtime accumulators for Tekmar Gateway 482."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .const import ThaActiveDemand
+
+# runtime totals kept for each reported demand
+DEMAND_KEYS = {
+    ThaActiveDemand.IDLE: "idle",
+    ThaActiveDemand.HEAT: "heat",
+    ThaActiveDemand.COOL: "cool",
+}
+
+# decimal places of runtime hours and duty cycle percentages as shown
+RUNTIME_DIGITS = 2
+DUTY_DIGITS = 0
+
+# rolling duty cycle windows: seconds covered and number of buckets
+DUTY_WINDOWS = {
+    "1h": (3600, 60),
+    "24h": (86400, 96),
+}
+
+
+class RollingWindow:
+    """Active seconds over a sliding window, kept in fixed time buckets.
+
+    Buckets are numbered from the epoch, so a window restored from storage
+    lines up with the current time. The oldest bucket is dropped whole, so
+    the window covers its length to within one bucket.
+    """
+
+    def __init__(self, length: float, buckets: int) -> None:
+        self.length = length
+        self._width = length / buckets
+        self._slots = [0.0] * buckets
+        self._bucket = None
+        self.total = 0.0
+
+    def advance(self, now: float) -> None:
+        """Drop the buckets that have left the window at now."""
+        bucket = int(now // self._width)
+
+        if self._bucket is not None and bucket > self._bucket:
+            for n in range(
+                self._bucket + 1, min(bucket, self._bucket + len(self._slots)) + 1
+            ):
+                self.total -= self._slots[n % len(self._slots)]
+                self._slots[n % len(self._slots)] = 0.0
+
+            self.total = max(self.total, 0.0)
+
+        if self._bucket is None or bucket > self._bucket:
+            self._bucket = bucket
+
+    def add(self, start: float, end: float) -> None:
+        """Count the time from start to end as active."""
+        self.advance(end)
+        start = max(start, (self._bucket - len(self._slots) + 1) * self._width)
+
+        while start < end:
+            bucket = int(start // self._width)
+            stop = min(end, (bucket + 1) * self._width)
+            self._slots[bucket % len(self._slots)] += stop - start
+            self.total += stop - start
+            start = stop
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"bucket": self._bucket, "slots": self._slots}
+
+    def load(self, data: dict[str, Any]) -> None:
+        if len(data["slots"]) != len(self._slots):
+            return
+
+        self._bucket = data["bucket"]
+        self._slots = [float(v) for v in data["slots"]]
+        self.total = sum(self._slots)
+
+
+class DemandRuntime:
+    """Heat, cool and idle runtime of one zone and its rolling duty cycles.
+
+    Time is accumulated at each demand transition, so an update costs the
+    same however long the zone has been running. Times are wall clock
+    seconds so the totals can be saved and restored across restarts. While
+    the demand is unknown nothing is counted.
+    """
+
+    def __init__(self) -> None:
+        self.totals = dict.fromkeys(DEMAND_KEYS.values(), 0.0)
+        self.windows = {
+            name: RollingWindow(length, buckets)
+            for name, (length, buckets) in DUTY_WINDOWS.items()
+        }
+        self._key = None
+        self._since = None
+        self._shown = None
+
+    def update(self, demand: int | None, now: float) -> None:
+        """Record a demand transition at now."""
+        self.checkpoint(now)
+        self._key = DEMAND_KEYS.get(demand)
+
+    def checkpoint(self, now: float) -> None:
+        """Add the time since the last transition or checkpoint to the totals."""
+        if self._key is not None and now > self._since:
+            self.totals[self._key] += now - self._since
+
+            if self._key != "idle":
+                for window in self.windows.values():
+                    window.add(self._since, now)
+
+        self._since = now
+
+    def runtime(self, key: str, now: float) -> float:
+        """Return the total seconds with demand key, up to now."""
+        total = self.totals[key]
+
+        if key == self._key and now > self._since:
+            total += now - self._since
+
+        return total
+
+    def duty_cycle(self, name: str, now: float) -> float:
+        """Return the percentage of the window with heat or cool demand."""
+        window = self.windows[name]
+        window.advance(now)
+        active = window.total
+
+        if self._key not in (None, "idle") and now > self._since:
+            active += now - max(self._since, now - window.length)
+
+        return min(100.0, 100.0 * active / window.length)
+
+    def hours(self, key: str, now: float) -> float:
+        """Return the runtime with demand key in hours, as shown."""
+        return round(self.runtime(key, now) / 3600, RUNTIME_DIGITS)
+
+    def percent(self, name: str, now: float) -> float:
+        """Return the duty cycle of a window in percent, as shown."""
+        return round(self.duty_cycle(name, now), DUTY_DIGITS)
+
+    def changed(self, now: float) -> bool:
+        """Return True if a shown value changed since the last call."""
+        shown = tuple(self.hours(key, now) for key in self.totals) + tuple(
+            self.percent(name, now) for name in self.windows
+        )
+
+        if shown == self._shown:
+            return False
+
+        self._shown = shown
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "totals": self.totals,
+            "windows": {name: w.as_dict() for name, w in self.windows.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> DemandRuntime:
+        """Restore saved totals and windows. The demand starts unknown."""
+        runtime = cls()
+
+        for key, value in data.get("totals", {}).items():
+            if key in runtime.totals:
+                runtime.totals[key] = float(value)
+
+        for name, window in data.get("windows", {}).items():
+            if name in runtime.windows:
+                runtime.windows[name].load(window)
+
+        return runtime
@@ -5,10 +5,11 @@ from __future__ import annotations
 from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DEVICE_FEATURES, DEVICE_TYPES, DOMAIN, ThaType, ThaValue
+from .const import DOMAIN, ThaType, ThaValue
 
 
 async def async_setup_entry(
@@ -21,17 +22,35 @@ async def async_setup_entry(
     entities = []
 
     for device in hub.tha_devices:
-        if DEVICE_TYPES[device.tha_device["type"]] == ThaType.THERMOSTAT:
-            if DEVICE_FEATURES[device.tha_device["type"]]["fan"]:
-                entities.append(ThaFanSelect(device, config_entry))
+        entities.extend(_device_entities(hub, device, config_entry))
 
     if entities:
         async_add_entities(entities)
 
+    @callback
+    def async_add_device(device) -> None:
+        async_add_entities(_device_entities(hub, device, config_entry))
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, hub.signal_device_added, async_add_device)
+    )
+
+
+def _device_entities(hub, device, config_entry) -> list[SelectEntity]:
+    """Create the select entities for a device."""
+    entities = []
+
+    if device.profile.device_type == ThaType.THERMOSTAT:
+        if device.profile.fan and device.profile.fan_percent:
+            entities.append(ThaFanSelect(device, config_entry))
+
+    return entities
+
 
 class ThaSelectBase(SelectEntity):
     """Base class for Tekmar select entities."""
 
+    tha_methods = None
     should_poll = False
 
     def __init__(self, tekmar_tha, config_entry):
@@ -56,7 +75,7 @@ class ThaSelectBase(SelectEntity):
         return self._config_entry.data["name"]
 
     async def async_added_to_hass(self):
-        self._tekmar_tha.register_callback(self.async_write_ha_state)
+        self._tekmar_tha.register_callback(self.async_write_ha_state, self.tha_methods)
 
     async def async_will_remove_from_hass(self):
         self._tekmar_tha.remove_callback(self.async_write_ha_state)
@@ -65,6 +84,8 @@ class ThaSelectBase(SelectEntity):
 class ThaFanSelect(ThaSelectBase):
     """Fan cycle selector for a Tekmar thermostat."""
 
+    tha_methods = ("FanPercent", "SetbackState")
+
     unit_of_measurement = PERCENTAGE
     icon = "mdi:fan"
 
@@ -81,10 +102,7 @@ class ThaFanSelect(ThaSelectBase):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.fan_percent == ThaValue.NA_8
-            or self._tekmar_tha.tha_device["attributes"].FanPercent == 0
-        ):
+        if self._tekmar_tha.fan_percent == ThaValue.NA_8:
             return False
 
         return super().available
@@ -102,7 +120,7 @@ class ThaFanSelect(ThaSelectBase):
 
     async def async_select_option(self, option: str) -> None:
         if option in ["0", "10", "20", "30", "40", "50", "60", "70", "80", "90", "100"]:
-            if self._tekmar_tha.tha_device["type"] in [99203, 99202, 99201]:
+            if self._tekmar_tha.profile.fan_steps:
                 value = int(option / 10)
                 await self._tekmar_tha.set_fan_percent_txqueue(value)
 
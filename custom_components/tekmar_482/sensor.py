@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
+import time
+
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import PERCENTAGE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, UnitOfTemperature, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 
 from .const import (
-    DEVICE_FEATURES,
-    DEVICE_TYPES,
+    CONF_HUMIDITY_DEADBAND,
+    CONF_MIN_WRITE_INTERVAL,
+    CONF_TEMP_DEADBAND,
+    DEFAULT_HUMIDITY_DEADBAND,
+    DEFAULT_MIN_WRITE_INTERVAL,
+    DEFAULT_TEMP_DEADBAND,
     DOMAIN,
     SETBACK_DESCRIPTION,
     SETBACK_STATE,
@@ -39,35 +47,61 @@ async def async_setup_entry(
     for gateway in hub.tha_gateway:
         entities.append(OutdoorTemprature(gateway, config_entry))
         entities.append(NetworkError(gateway, config_entry))
+        entities.append(ZonesCallingForHeat(gateway, config_entry))
+        entities.append(ZoneTemperatureAverage(gateway, config_entry))
+        entities.append(ZoneTemperatureMinimum(gateway, config_entry))
 
     for device in hub.tha_devices:
-        if DEVICE_TYPES[device.tha_device["type"]] == ThaType.THERMOSTAT:
-            entities.append(CurrentTemperature(device, config_entry))
-            entities.append(SetbackState(device, config_entry))
-
-            if DEVICE_FEATURES[device.tha_device["type"]][
-                "humid"
-            ] and hub.tha_pr_ver in [2, 3]:
-                entities.append(RelativeHumidity(device, config_entry))
-
-            if hub.tha_pr_ver in [3]:
-                entities.append(CurrentFloorTemperature(device, config_entry))
-
-        if DEVICE_TYPES[device.tha_device["type"]] == ThaType.SETPOINT:
-            if hub.tha_pr_ver in [3]:
-                entities.append(CurrentFloorTemperature(device, config_entry))
-            entities.append(CurrentTemperature(device, config_entry))
-            entities.append(SetbackState(device, config_entry))
-            entities.append(SetpointTarget(device, config_entry))
-            entities.append(SetpointDemand(device, config_entry))
+        entities.extend(_device_entities(hub, device, config_entry))
 
     if entities:
         async_add_entities(entities)
 
+    @callback
+    def async_add_device(device) -> None:
+        async_add_entities(_device_entities(hub, device, config_entry))
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, hub.signal_device_added, async_add_device)
+    )
+
+
+def _device_entities(hub, device, config_entry) -> list[SensorEntity]:
+    """Create the sensor entities for a device."""
+    entities = []
+
+    if device.profile.device_type == ThaType.THERMOSTAT:
+        entities.append(CurrentTemperature(device, config_entry))
+        entities.append(SetbackState(device, config_entry))
+
+        if device.profile.humidity:
+            entities.append(RelativeHumidity(device, config_entry))
+
+        if device.profile.floor_temperature:
+            entities.append(CurrentFloorTemperature(device, config_entry))
+
+    if device.profile.device_type == ThaType.SETPOINT:
+        if device.profile.floor_temperature:
+            entities.append(CurrentFloorTemperature(device, config_entry))
+        entities.append(CurrentTemperature(device, config_entry))
+        entities.append(SetbackState(device, config_entry))
+        entities.append(SetpointTarget(device, config_entry))
+        entities.append(SetpointDemand(device, config_entry))
+
+    entities.append(HeatRuntime(device, config_entry))
+    if device.profile.zone_cooling:
+        entities.append(CoolRuntime(device, config_entry))
+    entities.append(IdleRuntime(device, config_entry))
+    entities.append(DutyCycleHour(device, config_entry))
+    entities.append(DutyCycleDay(device, config_entry))
+
+    return entities
+
 
 class ThaSensorBase(SensorEntity):
     """Base class for Tekmar sensor entities."""
 
+    tha_methods = None
     suggested_display_precision = None
     should_poll = False
 
@@ -93,15 +127,99 @@ class ThaSensorBase(SensorEntity):
         return self._config_entry.data["name"]
 
     async def async_added_to_hass(self):
-        self._tekmar_tha.register_callback(self.async_write_ha_state)
+        self._tekmar_tha.register_callback(self.async_write_ha_state, self.tha_methods)
 
     async def async_will_remove_from_hass(self):
         self._tekmar_tha.remove_callback(self.async_write_ha_state)
 
 
-class OutdoorTemprature(ThaSensorBase):
+class ThaMeasurementSensorBase(ThaSensorBase):
+    """Base class for Tekmar measurement sensors.
+
+    A new state is written only when the value moves by at least the
+    deadband from the last written value, and no sooner than the minimum
+    write interval after the previous write. A change that arrives inside
+    the interval is written with the latest value once the interval ends.
+    """
+
+    deadband_option = None
+    deadband_default = 0
+
+    def __init__(self, tekmar_tha, config_entry):
+        super().__init__(tekmar_tha, config_entry)
+        self._written_value = None
+        self._written_available = None
+        self._written_at = None
+        self._cancel_write = None
+
+    @property
+    def deadband(self) -> float:
+        return self._config_entry.options.get(
+            self.deadband_option, self.deadband_default
+        )
+
+    @property
+    def min_write_interval(self) -> float:
+        return self._config_entry.options.get(
+            CONF_MIN_WRITE_INTERVAL, DEFAULT_MIN_WRITE_INTERVAL
+        )
+
+    async def async_added_to_hass(self):
+        # the platform writes the initial state after this returns
+        self._written_available = self.available
+        self._written_value = self.native_value
+        self._written_at = time.monotonic()
+        self._tekmar_tha.register_callback(self._async_update, self.tha_methods)
+
+    async def async_will_remove_from_hass(self):
+        self._tekmar_tha.remove_callback(self._async_update)
+        self._cancel_pending_write()
+
+    def _cancel_pending_write(self) -> None:
+        if self._cancel_write is not None:
+            self._cancel_write()
+            self._cancel_write = None
+
+    @callback
+    def _async_update(self) -> None:
+        available = self.available
+        value = self.native_value
+
+        if (
+            available == self._written_available
+            and value is not None
+            and self._written_value is not None
+            and abs(value - self._written_value) < self.deadband
+        ):
+            self._cancel_pending_write()
+            return
+
+        if available != self._written_available or self._written_at is None:
+            self._async_write()
+            return
+
+        wait = self._written_at + self.min_write_interval - time.monotonic()
+        if wait <= 0:
+            self._async_write()
+        elif self._cancel_write is None:
+            self._cancel_write = async_call_later(self.hass, wait, self._async_write)
+
+    @callback
+    def _async_write(self, _now=None) -> None:
+        self._cancel_pending_write()
+        self._written_available = self.available
+        self._written_value = self.native_value
+        self._written_at = time.monotonic()
+        self.async_write_ha_state()
+
+
+class OutdoorTemprature(ThaMeasurementSensorBase):
     """Outdoor temperature sensor."""
 
+    tha_methods = ("OutdoorTemperature",)
+    deadband_option = CONF_TEMP_DEADBAND
+    deadband_default = DEFAULT_TEMP_DEADBAND
+
     device_class = SensorDeviceClass.TEMPERATURE
     state_class = SensorStateClass.MEASUREMENT
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -117,10 +235,7 @@ class OutdoorTemprature(ThaSensorBase):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.outdoor_temprature == ThaValue.NA_16
-            or self._tekmar_tha.outdoor_temprature is None
-        ):
+        if self._tekmar_tha.outdoor_temprature is None:
             return False
 
         return super().available
@@ -134,9 +249,104 @@ class OutdoorTemprature(ThaSensorBase):
             return None
 
 
+class ZonesCallingForHeat(ThaSensorBase):
+    """Number of thermostat zones calling for heat."""
+
+    tha_methods = ("ZonesCallingForHeat",)
+
+    state_class = SensorStateClass.MEASUREMENT
+    icon = "mdi:fire"
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self.config_entry_id}-zones-calling-for-heat"
+
+    @property
+    def name(self) -> str:
+        return f"{self.config_entry_name.capitalize()} Zones Calling for Heat"
+
+    @property
+    def native_value(self):
+        return self._tekmar_tha.zones_calling_for_heat
+
+
+class ZoneTemperatureAverage(ThaMeasurementSensorBase):
+    """Average temperature of all thermostat zones."""
+
+    tha_methods = ("ZoneTemperatureAverage",)
+    deadband_option = CONF_TEMP_DEADBAND
+    deadband_default = DEFAULT_TEMP_DEADBAND
+
+    device_class = SensorDeviceClass.TEMPERATURE
+    state_class = SensorStateClass.MEASUREMENT
+    native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    suggested_display_precision = 1
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self.config_entry_id}-zone-temperature-average"
+
+    @property
+    def name(self) -> str:
+        return f"{self.config_entry_name.capitalize()} Zone Temperature Average"
+
+    @property
+    def available(self) -> bool:
+        if self._tekmar_tha.zone_temperature_average is None:
+            return False
+
+        return super().available
+
+    @property
+    def native_value(self):
+        try:
+            return degHtoC(self._tekmar_tha.zone_temperature_average)
+
+        except TypeError:
+            return None
+
+
+class ZoneTemperatureMinimum(ThaMeasurementSensorBase):
+    """Lowest temperature of all thermostat zones."""
+
+    tha_methods = ("ZoneTemperatureMinimum",)
+    deadband_option = CONF_TEMP_DEADBAND
+    deadband_default = DEFAULT_TEMP_DEADBAND
+
+    device_class = SensorDeviceClass.TEMPERATURE
+    state_class = SensorStateClass.MEASUREMENT
+    native_unit_of_measurement = UnitOfTemperature.CELSIUS
+    suggested_display_precision = 1
+
+    @property
+    def unique_id(self) -> str:
+        return f"{self.config_entry_id}-zone-temperature-minimum"
+
+    @property
+    def name(self) -> str:
+        return f"{self.config_entry_name.capitalize()} Zone Temperature Minimum"
+
+    @property
+    def available(self) -> bool:
+        if self._tekmar_tha.zone_temperature_minimum is None:
+            return False
+
+        return super().available
+
+    @property
+    def native_value(self):
+        try:
+            return degHtoC(self._tekmar_tha.zone_temperature_minimum)
+
+        except TypeError:
+            return None
+
+
 class NetworkError(ThaSensorBase):
     """TN4 network error sensor."""
 
+    tha_methods = ("NetworkError",)
+
     entity_category = EntityCategory.DIAGNOSTIC
     icon = "mdi:alert-outline"
 
@@ -205,9 +415,13 @@ class NetworkError(ThaSensorBase):
             return {"description": "Unknown Error"}
 
 
-class CurrentTemperature(ThaSensorBase):
+class CurrentTemperature(ThaMeasurementSensorBase):
     """Current temperature sensor for a Tekmar thermostat."""
 
+    tha_methods = ("CurrentTemperature",)
+    deadband_option = CONF_TEMP_DEADBAND
+    deadband_default = DEFAULT_TEMP_DEADBAND
+
     device_class = SensorDeviceClass.TEMPERATURE
     state_class = SensorStateClass.MEASUREMENT
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -227,8 +441,7 @@ class CurrentTemperature(ThaSensorBase):
     @property
     def available(self) -> bool:
         if (
-            self._tekmar_tha.current_temperature == ThaValue.NA_16
-            or self._tekmar_tha.current_temperature == ThaValue.OFF
+            self._tekmar_tha.current_temperature == ThaValue.OFF
             or self._tekmar_tha.current_temperature is None
         ):
             return False
@@ -244,9 +457,13 @@ class CurrentTemperature(ThaSensorBase):
             return None
 
 
-class CurrentFloorTemperature(ThaSensorBase):
+class CurrentFloorTemperature(ThaMeasurementSensorBase):
     """Current floor temperature sensor for a Tekmar thermostat."""
 
+    tha_methods = ("CurrentFloorTemperature",)
+    deadband_option = CONF_TEMP_DEADBAND
+    deadband_default = DEFAULT_TEMP_DEADBAND
+
     device_class = SensorDeviceClass.TEMPERATURE
     state_class = SensorStateClass.MEASUREMENT
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -265,13 +482,12 @@ class CurrentFloorTemperature(ThaSensorBase):
 
     @property
     def entity_registry_enabled_default(self) -> bool:
-        return self._tekmar_tha.tha_device["attributes"].SlabSetpoint
+        return self._tekmar_tha.profile.slab_setpoint
 
     @property
     def available(self) -> bool:
         if (
-            self._tekmar_tha.current_floor_temperature == ThaValue.NA_16
-            or self._tekmar_tha.current_floor_temperature == ThaValue.OFF
+            self._tekmar_tha.current_floor_temperature == ThaValue.OFF
             or self._tekmar_tha.current_floor_temperature is None
         ):
             return False
@@ -287,9 +503,13 @@ class CurrentFloorTemperature(ThaSensorBase):
             return None
 
 
-class RelativeHumidity(ThaSensorBase):
+class RelativeHumidity(ThaMeasurementSensorBase):
     """Current humidity sensor for a Tekmar thermostat."""
 
+    tha_methods = ("RelativeHumidity",)
+    deadband_option = CONF_HUMIDITY_DEADBAND
+    deadband_default = DEFAULT_HUMIDITY_DEADBAND
+
     device_class = SensorDeviceClass.HUMIDITY
     state_class = SensorStateClass.MEASUREMENT
     native_unit_of_measurement = PERCENTAGE
@@ -308,10 +528,7 @@ class RelativeHumidity(ThaSensorBase):
 
     @property
     def available(self) -> bool:
-        if (
-            self._tekmar_tha.relative_humidity == ThaValue.NA_8
-            or self._tekmar_tha.relative_humidity is None
-        ):
+        if self._tekmar_tha.relative_humidity is None:
             return False
 
         return super().available
@@ -324,6 +541,8 @@ class RelativeHumidity(ThaSensorBase):
 class SetbackState(ThaSensorBase):
     """Current setback state for a Tekmar thermostat."""
 
+    tha_methods = ("SetbackState",)
+
     icon = "mdi:format-list-bulleted"
 
     @property
@@ -373,6 +592,8 @@ class SetbackState(ThaSensorBase):
 class SetpointTarget(ThaSensorBase):
     """Current setpoint sensor for a Tekmar setpoint control."""
 
+    tha_methods = ("SetpointDevice",)
+
     device_class = SensorDeviceClass.TEMPERATURE
     state_class = SensorStateClass.MEASUREMENT
     native_unit_of_measurement = UnitOfTemperature.CELSIUS
@@ -392,8 +613,7 @@ class SetpointTarget(ThaSensorBase):
     @property
     def available(self) -> bool:
         if (
-            self._tekmar_tha.setpoint_target == ThaValue.NA_16
-            or self._tekmar_tha.setpoint_target == ThaValue.OFF
+            self._tekmar_tha.setpoint_target == ThaValue.OFF
             or self._tekmar_tha.setpoint_target is None
         ):
             return False
@@ -412,6 +632,8 @@ class SetpointTarget(ThaSensorBase):
 class SetpointDemand(ThaSensorBase):
     """Current setpoint demand for a Tekmar setpoint control."""
 
+    tha_methods = ("ActiveDemand",)
+
     icon = "mdi:format-list-bulleted"
 
     @property
@@ -439,3 +661,94 @@ class SetpointDemand(ThaSensorBase):
 
         except KeyError:
             return None
+
+
+class ThaRuntimeSensorBase(ThaSensorBase):
+    """Base class for the demand runtime of a zone, in hours."""
+
+    tha_methods = ("DemandRuntime",)
+    demand_key = None
+
+    device_class = SensorDeviceClass.DURATION
+    state_class = SensorStateClass.TOTAL_INCREASING
+    native_unit_of_measurement = UnitOfTime.HOURS
+    suggested_display_precision = 2
+
+    @property
+    def unique_id(self) -> str:
+        return (
+            f"{self.config_entry_id}-{self._tekmar_tha.model}"
+            f"-{self._tekmar_tha.device_id}-{self.demand_key}-runtime"
+        )
+
+    @property
+    def name(self) -> str:
+        return (
+            f"{self._tekmar_tha.tha_full_device_name} "
+            f"{self.demand_key.capitalize()} Runtime"
+        )
+
+    @property
+    def native_value(self):
+        return self._tekmar_tha.runtime.hours(self.demand_key, time.time())
+
+
+class HeatRuntime(ThaRuntimeSensorBase):
+    """Total time a zone has called for heat."""
+
+    demand_key = "heat"
+    icon = "mdi:fire"
+
+
+class CoolRuntime(ThaRuntimeSensorBase):
+    """Total time a zone has called for cooling."""
+
+    demand_key = "cool"
+    icon = "mdi:snowflake"
+
+
+class IdleRuntime(ThaRuntimeSensorBase):
+    """Total time a zone has had no demand."""
+
+    demand_key = "idle"
+    icon = "mdi:power-sleep"
+    entity_registry_enabled_default = False
+
+
+class ThaDutyCycleSensorBase(ThaSensorBase):
+    """Base class for the rolling duty cycle of a zone."""
+
+    tha_methods = ("DemandRuntime",)
+    window = None
+
+    state_class = SensorStateClass.MEASUREMENT
+    native_unit_of_measurement = PERCENTAGE
+    suggested_display_precision = 0
+    icon = "mdi:percent-circle-outline"
+
+    @property
+    def unique_id(self) -> str:
+        return (
+            f"{self.config_entry_id}-{self._tekmar_tha.model}"
+            f"-{self._tekmar_tha.device_id}-duty-cycle-{self.window}"
+        )
+
+    @property
+    def name(self) -> str:
+        return f"{self._tekmar_tha.tha_full_device_name} Duty Cycle {self.window}"
+
+    @property
+    def native_value(self):
+        return self._tekmar_tha.runtime.percent(self.window, time.time())
+
+
+class DutyCycleHour(ThaDutyCycleSensorBase):
+    """Share of the last hour a zone had heat or cool demand."""
+
+    window = "1h"
+
+
+class DutyCycleDay(ThaDutyCycleSensorBase):
+    """Share of the last 24 hours a zone had heat or cool demand."""
+
+    window = "24h"
@@ -0,0 +1,115 @@
+"""Startup phase timeline for Tekmar Gateway 482."""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class StartupTrace:
+    """Monotonic timeline of the startup of one config entry.
+
+    Phases are spans with a start and an end, on a named track so phases
+    that overlap, like the inventory of several devices, are kept apart.
+    Marks are single points in time. All times are seconds since the trace
+    was created.
+    """
+
+    def __init__(self) -> None:
+        self._origin = time.monotonic()
+        self._open = {}
+        self.phases = []
+        self.marks = {}
+
+    def _now(self) -> float:
+        return time.monotonic() - self._origin
+
+    def begin(self, name: str, track: str = "setup") -> None:
+        """Start a phase that is ended with end(name)."""
+        self._open.setdefault(name, (track, self._now()))
+
+    def end(self, name: str) -> None:
+        """End a phase started with begin(name). Unknown names are ignored."""
+        try:
+            track, start = self._open.pop(name)
+        except KeyError:
+            return
+
+        self.phases.append((name, track, start, self._now()))
+
+    @contextmanager
+    def phase(self, name: str, track: str = "setup") -> Iterator[None]:
+        """Time the enclosed block as a phase."""
+        self.begin(name, track)
+        try:
+            yield
+        finally:
+            self.end(name)
+
+    def mark(self, name: str) -> bool:
+        """Record a point in time once. Return True if it was recorded now."""
+        if name in self.marks:
+            return False
+
+        self.marks[name] = self._now()
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the phases and marks for diagnostics."""
+        return {
+            "phases": [
+                {
+                    "name": name,
+                    "track": track,
+                    "start": round(start, 4),
+                    "duration": round(end - start, 4),
+                }
+                for name, track, start, end in self.phases
+            ],
+            "marks": {name: round(at, 4) for name, at in self.marks.items()},
+        }
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Return the timeline in Chrome trace event format.
+
+        Save it as a .json file and open it in chrome://tracing or Perfetto.
+        """
+        tids = {"setup": 1}
+        for _, track, _, _ in self.phases:
+            tids.setdefault(track, len(tids) + 1)
+
+        events = [
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": 1,
+                "tid": tid,
+                "args": {"name": track},
+            }
+            for track, tid in tids.items()
+        ]
+        events.extend(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": round(start * 1e6),
+                "dur": round((end - start) * 1e6),
+                "pid": 1,
+                "tid": tids[track],
+            }
+            for name, track, start, end in self.phases
+        )
+        events.extend(
+            {
+                "name": name,
+                "ph": "i",
+                "ts": round(at * 1e6),
+                "s": "g",
+                "pid": 1,
+                "tid": 1,
+            }
+            for name, at in self.marks.items()
+        )
+
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
@@ -0,0 +1,182 @@
+"""Columnar zone state for Tekmar Gateway 482."""
+
+from __future__ import annotations
+
+import heapq
+from array import array
+from collections import Counter
+
+# stored for a value that has not been reported, read back as None
+NONE = -(2**31)
+
+# reported zone fields and how many values each has, by setback or index
+ZONE_FIELDS = {
+    "current_temperature": 1,  # degH
+    "current_floor_temperature": 1,  # degH
+    "setpoint_target": 1,  # degH
+    "relative_humidity": 1,
+    "active_demand": 1,
+    "setback_state": 1,
+    "mode_setting": 1,
+    "humidity_setpoint_min": 1,
+    "humidity_setpoint_max": 1,
+    "heat_setpoint": 3,  # degE, day/night/away
+    "cool_setpoint": 3,  # degE, day/night/away
+    "slab_setpoint": 3,  # degE, day/night/away
+    "fan_percent": 2,  # day/night
+}
+
+# fields with a running sum and a lazily pruned minimum heap
+SUMMED_FIELDS = ("current_temperature",)
+
+# fields with a running count of each value
+COUNTED_FIELDS = ("active_demand",)
+
+
+class ZoneStateTable:
+    """Reported state of all zones, one int32 array per field.
+
+    Each zone device owns a slot, its index in every column. Released slots
+    are reset and reused, so columns only grow to the largest number of zones
+    at once. Reductions over a column skip unreported values.
+
+    The mean and minimum of SUMMED_FIELDS and value counts of COUNTED_FIELDS
+    are kept up to date on every change, so reading them does not scan the
+    columns. Only slots allocated as aggregated take part. The minimum heap
+    keeps replaced values until they reach the top.
+    """
+
+    def __init__(self) -> None:
+        self._columns = {
+            (field, index): array("i")
+            for field, width in ZONE_FIELDS.items()
+            for index in range(width)
+        }
+        self._free = []
+        self._size = 0
+        self._aggregated = bytearray()
+
+        self._sums = {field: 0 for field in SUMMED_FIELDS}
+        self._reported = {field: 0 for field in SUMMED_FIELDS}
+        self._heaps = {field: [] for field in SUMMED_FIELDS}
+        self._value_counts = Counter()
+
+    def __len__(self) -> int:
+        """Return the number of slots in use."""
+        return self._size - len(self._free)
+
+    def allocate(self, aggregated: bool = True) -> int:
+        """Return a free slot with every field unreported.
+
+        The values of an aggregated slot are included in the aggregates.
+        """
+        if self._free:
+            slot = self._free.pop()
+        else:
+            for column in self._columns.values():
+                column.append(NONE)
+            self._aggregated.append(0)
+            self._size += 1
+            slot = self._size - 1
+
+        self._aggregated[slot] = aggregated
+        return slot
+
+    def release(self, slot: int) -> None:
+        """Reset a slot and make it available again."""
+        for field, index in self._columns:
+            self.set(slot, field, None, index)
+
+        self._aggregated[slot] = False
+        self._free.append(slot)
+
+    def get(self, slot: int, field: str, index: int = 0) -> int | None:
+        value = self._columns[field, index][slot]
+        return None if value == NONE else value
+
+    def set(self, slot: int, field: str, value: int | None, index: int = 0) -> bool:
+        """Store a value and return True if it changed."""
+        column = self._columns[field, index]
+        value = NONE if value is None else value
+
+        old = column[slot]
+        if old == value:
+            return False
+
+        column[slot] = value
+
+        if self._aggregated[slot]:
+            if field in self._sums:
+                self._update_sum(field, slot, old, value)
+
+            elif field in COUNTED_FIELDS:
+                if old != NONE:
+                    self._value_counts[field, old] -= 1
+                if value != NONE:
+                    self._value_counts[field, value] += 1
+
+        return True
+
+    def _update_sum(self, field: str, slot: int, old: int, value: int) -> None:
+        if old != NONE:
+            self._sums[field] -= old
+            self._reported[field] -= 1
+
+        if value != NONE:
+            self._sums[field] += value
+            self._reported[field] += 1
+
+            heap = self._heaps[field]
+            heapq.heappush(heap, (value, slot))
+
+            # drop replaced values once they outnumber the current ones
+            if len(heap) > 2 * self._size + 16:
+                column = self._columns[field, 0]
+                heap[:] = [
+                    (v, s)
+                    for s, v in enumerate(column)
+                    if v != NONE and self._aggregated[s]
+                ]
+                heapq.heapify(heap)
+
+    def values(self, field: str, index: int = 0) -> list[int]:
+        """Return the reported values of a field."""
+        return [v for v in self._columns[field, index] if v != NONE]
+
+    def count(self, field: str, value: int, index: int = 0) -> int:
+        """Return the number of zones where field equals value.
+
+        For COUNTED_FIELDS only aggregated slots are counted.
+        """
+        if field in COUNTED_FIELDS and index == 0:
+            return self._value_counts[field, value]
+
+        return self._columns[field, index].count(value)
+
+    def mean(self, field: str, index: int = 0) -> float | None:
+        """Return the average reported value of a field, or None.
+
+        For SUMMED_FIELDS only aggregated slots are averaged.
+        """
+        if field in self._sums and index == 0:
+            if not self._reported[field]:
+                return None
+            return self._sums[field] / self._reported[field]
+
+        values = self.values(field, index)
+        if not values:
+            return None
+
+        return sum(values) / len(values)
+
+    def minimum(self, field: str) -> int | None:
+        """Return the lowest value of a summed field in aggregated slots."""
+        heap = self._heaps[field]
+        column = self._columns[field, 0]
+
+        while heap and (
+            column[heap[0][1]] != heap[0][0] or not self._aggregated[heap[0][1]]
+        ):
+            heapq.heappop(heap)
+
+        return heap[0][0] if heap else None
@@ -4,11 +4,12 @@ from __future__ import annotations
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DEVICE_FEATURES, DEVICE_TYPES, DOMAIN, ThaType, ThaValue
+from .const import DOMAIN, ThaType, ThaValue
 
 
 async def async_setup_entry(
@@ -21,7 +22,7 @@ async def async_setup_entry(
     entities = []
 
     for gateway in hub.tha_gateway:
-        if hub.tha_pr_ver in [2, 3]:
+        if gateway.has_setpoint_groups:
             entities.append(ThaSetpointGroup(gateway, config_entry, 0x01))
             entities.append(ThaSetpointGroup(gateway, config_entry, 0x02))
             entities.append(ThaSetpointGroup(gateway, config_entry, 0x03))
@@ -36,19 +37,37 @@ async def async_setup_entry(
             entities.append(ThaSetpointGroup(gateway, config_entry, 0x0C))
 
     for device in hub.tha_devices:
-        if DEVICE_TYPES[device.tha_device["type"]] == ThaType.THERMOSTAT:
-            if DEVICE_FEATURES[device.tha_device["type"]]["emer"]:
-                entities.append(EmergencyHeat(device, config_entry))
-            if DEVICE_FEATURES[device.tha_device["type"]]["fan"]:
-                entities.append(ConfigVentMode(device, config_entry))
+        entities.extend(_device_entities(hub, device, config_entry))
 
     if entities:
         async_add_entities(entities)
 
+    @callback
+    def async_add_device(device) -> None:
+        async_add_entities(_device_entities(hub, device, config_entry))
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(hass, hub.signal_device_added, async_add_device)
+    )
+
+
+def _device_entities(hub, device, config_entry) -> list[SwitchEntity]:
+    """Create the switch entities for a device."""
+    entities = []
+
+    if device.profile.device_type == ThaType.THERMOSTAT:
+        if device.profile.emergency_heat:
+            entities.append(EmergencyHeat(device, config_entry))
+        if device.profile.fan:
+            entities.append(ConfigVentMode(device, config_entry))
+
+    return entities
+
 
 class ThaSwitchBase(SwitchEntity):
     """Base class for Tekmar switch entities."""
 
+    tha_methods = None
     should_poll = False
 
     def __init__(self, tekmar_tha, config_entry):
@@ -72,7 +91,7 @@ class ThaSwitchBase(SwitchEntity):
         return self._config_entry.data["name"]
 
     async def async_added_to_hass(self):
-        self._tekmar_tha.register_callback(self.async_write_ha_state)
+        self._tekmar_tha.register_callback(self.async_write_ha_state, self.tha_methods)
 
     async def async_will_remove_from_hass(self):
         self._tekmar_tha.remove_callback(self.async_write_ha_state)
@@ -81,6 +100,8 @@ class ThaSwitchBase(SwitchEntity):
 class ThaSetpointGroup(ThaSwitchBase):
     """A switch to enable or disable a gateway setpoint group."""
 
+    tha_methods = ("SetpointGroupEnable",)
+
     icon = "mdi:select-group"
 
     def __init__(self, tekmar_tha, config_entry, group: int):
@@ -140,6 +161,8 @@ class EmergencyHeat(ThaSwitchBase):
     This switch will show if the thermostat is in emergency/aux mode (and set it).
     """
 
+    tha_methods = ("ModeSetting",)
+
     entity_category = EntityCategory.CONFIG
     icon = "mdi:hvac"
 
@@ -177,6 +200,8 @@ class EmergencyHeat(ThaSwitchBase):
 class ConfigVentMode(ThaSwitchBase):
     """Config option for thermostat vent mode (can't be read via network)."""
 
+    tha_methods = ()
+
     entity_category = EntityCategory.CONFIG
     icon = "mdi:fan-plus"
 
@@ -0,0 +1,66 @@
+"""Hashed timer wheel for tracking many deadlines with one timer."""
+
+from __future__ import annotations
+
+from typing import Hashable
+
+
+class TimerWheel:
+    """Hashed timer wheel.
+
+    Deadlines are rounded up to a tick and stored in one of a fixed number of
+    slots. Advancing the wheel only visits the slots for ticks that have
+    passed, so the cost does not depend on how many keys are scheduled.
+    """
+
+    def __init__(self, tick: float, slots: int, now: float) -> None:
+        self._tick = tick
+        self._slots = [{} for _ in range(slots)]
+        self._where = {}
+        self._current = int(now // tick)
+
+    def __len__(self) -> int:
+        return len(self._where)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._where
+
+    def schedule(self, key: Hashable, when: float) -> None:
+        """Schedule key to expire at time when, replacing any earlier deadline."""
+        self.cancel(key)
+
+        tick = max(-int(-when // self._tick), self._current + 1)
+        self._slots[tick % len(self._slots)][key] = tick
+        self._where[key] = tick
+
+    def cancel(self, key: Hashable) -> None:
+        """Remove key from the wheel if it is scheduled."""
+        tick = self._where.pop(key, None)
+        if tick is not None:
+            del self._slots[tick % len(self._slots)][key]
+
+    def advance(self, now: float) -> list[Hashable]:
+        """Advance the wheel to time now and return the keys that expired."""
+        target = int(now // self._tick)
+        if target <= self._current:
+            return []
+
+        if target - self._current >= len(self._slots):
+            slots = self._slots
+        else:
+            slots = [
+                self._slots[tick % len(self._slots)]
+                for tick in range(self._current + 1, target + 1)
+            ]
+
+        self._current = target
+
+        expired = []
+        for slot in slots:
+            for key, tick in list(slot.items()):
+                if tick <= target:
+                    del slot[key]
+                    del self._where[key]
+                    expired.append(key)
+
+        return expired
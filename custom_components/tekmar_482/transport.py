@@ -0,0 +1,170 @@
+"""Transports that connect a TrpcSocket to a packet server."""
+
+from __future__ import annotations
+
+import asyncio
+import socket
+
+from .const import KEEPALIVE_COUNT, KEEPALIVE_IDLE, KEEPALIVE_INTERVAL
+
+# keepalive options by name, where the platform supports them
+KEEPALIVE_OPTIONS = [
+    ("TCP_KEEPIDLE", "keepalive_idle"),
+    ("TCP_KEEPINTVL", "keepalive_interval"),
+    ("TCP_KEEPCNT", "keepalive_count"),
+]
+
+
+# ******************************************************************************
+class Transport:
+    """Opens a stream connection to a packet server."""
+
+    # **************************************************************************
+    async def open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Connect and return a (reader, writer) pair."""
+        raise NotImplementedError
+
+
+# ******************************************************************************
+class TcpTransport(Transport):
+    """TCP connection to a packet server on the network."""
+
+    # **************************************************************************
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        nodelay: bool = True,
+        keepalive: bool = True,
+        keepalive_idle: int = KEEPALIVE_IDLE,
+        keepalive_interval: int = KEEPALIVE_INTERVAL,
+        keepalive_count: int = KEEPALIVE_COUNT,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.nodelay = nodelay
+        self.keepalive = keepalive
+        self.keepalive_idle = keepalive_idle
+        self.keepalive_interval = keepalive_interval
+        self.keepalive_count = keepalive_count
+
+    # **************************************************************************
+    async def open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(
+                socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if self.nodelay else 0
+            )
+            sock.setsockopt(
+                socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1 if self.keepalive else 0
+            )
+
+            if self.keepalive:
+                for option, attr in KEEPALIVE_OPTIONS:
+                    if hasattr(socket, option):
+                        sock.setsockopt(
+                            socket.IPPROTO_TCP,
+                            getattr(socket, option),
+                            getattr(self, attr),
+                        )
+
+        return reader, writer
+
+    # **************************************************************************
+    def __str__(self) -> str:
+        return f"{self.host}:{self.port}"
+
+
+# ******************************************************************************
+class UnixTransport(Transport):
+    """Unix domain socket connection to a packet server on the same host."""
+
+    # **************************************************************************
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    # **************************************************************************
+    async def open(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_unix_connection(self.path)
+
+    # **************************************************************************
+    def __str__(self) -> str:
+        return self.path
+
+
+# ******************************************************************************
+class _LoopbackWriter:
+    """The subset of StreamWriter used by TrpcSocket, feeding a peer reader."""
+
+    # **************************************************************************
+    def __init__(self, peer: asyncio.StreamReader) -> None:
+        self._peer = peer
+        self._closed = False
+
+    # **************************************************************************
+    def write(self, data: bytes) -> None:
+        if not self._closed:
+            self._peer.feed_data(data)
+
+    # **************************************************************************
+    async def drain(self) -> None:
+        if self._closed:
+            raise ConnectionResetError("Loopback closed")
+
+    # **************************************************************************
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._peer.feed_eof()
+
+    # **************************************************************************
+    def is_closing(self) -> bool:
+        return self._closed
+
+    # **************************************************************************
+    async def wait_closed(self) -> None:
+        pass
+
+    # **************************************************************************
+    def get_extra_info(self, name, default=None):
+        return default
+
+
+# ******************************************************************************
+class LoopbackTransport(Transport):
+    """In-memory connection for tests and benchmarks.
+
+    Each open() creates a new connection. The packet server side of the most
+    recent one is available as server_reader and server_writer.
+    """
+
+    # **************************************************************************
+    def __init__(self) -> None:
+        self.server_reader = None
+        self.server_writer = None
+
+    # **************************************************************************
+    async def open(self) -> tuple[asyncio.StreamReader, _LoopbackWriter]:
+        client_reader = asyncio.StreamReader()
+        self.server_reader = asyncio.StreamReader()
+
+        self.server_writer = _LoopbackWriter(client_reader)
+        return client_reader, _LoopbackWriter(self.server_reader)
+
+    # **************************************************************************
+    def __str__(self) -> str:
+        return "loopback"
+
+
+# ******************************************************************************
+def transport_for(host: str, port: int) -> Transport:
+    """Return the transport for a configured packet server address.
+
+    An absolute path is a unix domain socket and the port is ignored.
+    """
+    if host.startswith("/"):
+        return UnixTransport(host)
+
+    return TcpTransport(host, port)
@@ -1,4 +1,17 @@
-from .fields import FieldList, Int8, Int16, Int32, Record
+import struct
+from functools import lru_cache
+
+from .const import DeviceAttributes
+from .fields import (
+    LITTLE_ENDIAN,
+    Bitfield,
+    Bitmask,
+    FieldList,
+    Int8,
+    Int16,
+    Int32,
+    Record,
+)
 from .packet import TYPE_TRPC, Packet
 
 # *****************************************************************************
@@ -172,6 +185,164 @@ methodID_from_name = dict(
 )
 
 
+# *****************************************************************************
+# Method IDs whose message body starts with a 16-bit device address.
+#
+address_methodIDs = frozenset(
+    method_id
+    for method_id, f in method_formats.items()
+    if f.fields and f.fields[0].name == "address"
+)
+
+
+# *****************************************************************************
+# Message body fields where an all-ones value means the gateway has no
+# reading. These are decoded as None.
+#
+na_fields = {
+    "OutdoorTemperature": ("temp",),
+    "CurrentTemperature": ("temp",),
+    "CurrentFloorTemperature": ("temp",),
+    "SetpointDevice": ("temp",),
+    "HeatSetpoint": ("setpoint",),
+    "CoolSetpoint": ("setpoint",),
+    "SlabSetpoint": ("setpoint",),
+    "RelativeHumidity": ("percent",),
+}
+
+# *****************************************************************************
+# Bit layout of the DeviceAttributes attributes field.
+#
+device_attributes_format = Bitfield(
+    "attributes",
+    LITTLE_ENDIAN,
+    Bitmask("ZoneHeating", 1),
+    Bitmask("ZoneCooling", 1),
+    Bitmask("SlabSetpoint", 1),
+    Bitmask("FanPercent", 1),
+)
+
+
+def decode_device_attributes(value):
+    return DeviceAttributes._make(
+        [bool(v) for v in device_attributes_format.decode(value)]
+    )
+
+
+# *****************************************************************************
+# Message body fields that are converted when a message is decoded.
+#
+field_converters = {
+    "DeviceAttributes": {"attributes": decode_device_attributes},
+}
+
+struct_codes = {Int8: "B", Int16: "H", Int32: "I"}
+
+
+# *****************************************************************************
+class TrpcMessage:
+    """A decoded tRPC message.
+
+    One subclass per method is generated from method_formats, with the body
+    fields as slots. Methods without an address report address 0. Messages
+    are read-only, so a decoded message can be shared from the decode cache.
+    """
+
+    __slots__ = ("serviceID", "methodID")
+
+    method = None
+    fields = ()
+    address = 0
+    _struct = struct.Struct("<")
+    _na = ()
+    _convert = ()
+
+    # *************************************************************************
+    def __init__(self, serviceID, methodID, *values):
+        object.__setattr__(self, "serviceID", serviceID)
+        object.__setattr__(self, "methodID", methodID)
+        for name, value in zip(self.fields, values):
+            object.__setattr__(self, name, value)
+
+    # *************************************************************************
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    # *************************************************************************
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    # *************************************************************************
+    def unpack(cls, serviceID, methodID, data):
+        """Create a message from the body bytes, or return None if there are
+        too few of them. Bytes past the end of the body are ignored.
+        """
+        try:
+            values = cls._struct.unpack_from(data)
+        except struct.error:
+            return None
+
+        if cls._na:
+            values = [
+                None if (i in cls._na and v == cls._na[i]) else v
+                for i, v in enumerate(values)
+            ]
+
+        if cls._convert:
+            values = list(values)
+            for i, convert in cls._convert:
+                values[i] = convert(values[i])
+
+        return cls(serviceID, methodID, *values)
+
+    unpack = classmethod(unpack)
+
+    # *************************************************************************
+    def __str__(self):
+        """String representation of the message."""
+        service_name = name_from_serviceID.get(
+            self.serviceID, "0x%04X" % self.serviceID
+        )
+        values = " ".join("%s=%s" % (f, getattr(self, f)) for f in self.fields)
+        return "%s %s %s" % (service_name.ljust(16), self.method.ljust(18), values)
+
+
+# *****************************************************************************
+def message_class(f):
+    """Generate the TrpcMessage subclass for a method FieldList."""
+    names = tuple(field.name for field in f.fields)
+    codes = "".join(struct_codes[type(field)] for field in f.fields)
+    na = {
+        names.index(name): (1 << (8 * f.fields[names.index(name)].size)) - 1
+        for name in na_fields.get(f.name, ())
+    }
+    convert = tuple(
+        (names.index(name), func)
+        for name, func in field_converters.get(f.name, {}).items()
+    )
+
+    return type(
+        f.name,
+        (TrpcMessage,),
+        {
+            "__slots__": names,
+            "method": f.name,
+            "fields": names,
+            "_struct": struct.Struct("<" + codes),
+            "_na": na,
+            "_convert": convert,
+        },
+    )
+
+
+# *****************************************************************************
+# Lookup message classes from method IDs.
+#
+message_classes = {
+    method_id: message_class(f) for method_id, f in method_formats.items()
+}
+
+
 # *****************************************************************************
 class TrpcPacket:
     # *************************************************************************
@@ -277,6 +448,70 @@ class TrpcPacket:
 
     from_rx_packet = staticmethod(from_rx_packet)
 
+    # *************************************************************************
+    def decode(pck_str):
+        """Create a TrpcMessage from a packet string (as it would be received
+        from a socket connection. Return None if it is not a tRPC packet of a
+        known method.
+        """
+        ln = len(pck_str) & ~1
+        try:
+            data = bytes.fromhex(bytes(pck_str[:ln]).decode())
+        except ValueError:
+            return None
+
+        if len(data) < 6 or data[0] != TYPE_TRPC:
+            return None
+
+        method_id = int.from_bytes(data[2:6], "little")
+
+        try:
+            cls = message_classes[method_id]
+        except KeyError:
+            return None
+
+        return cls.unpack(data[1], method_id, data[6:])
+
+    decode = staticmethod(decode)
+
+    # *************************************************************************
+    def message(self):
+        """Return the TrpcMessage for this packet."""
+        cls = message_classes[self.header["methodID"]]
+
+        values = [self.body[name] for name in cls.fields]
+        for i, convert in cls._convert:
+            values[i] = convert(values[i])
+
+        return cls(self.header["serviceID"], self.header["methodID"], *values)
+
+    # *************************************************************************
+    def peek(pck_str):
+        """Decode only the fixed-offset header of a packet string.
+
+        Return a (serviceID, methodID, address) tuple without building any
+        records. The address is None for methods that do not carry one. None
+        is returned if the string is not a tRPC packet.
+        """
+        try:
+            header = bytes.fromhex(bytes(pck_str[:16]).decode())
+        except ValueError:
+            return None
+
+        if len(header) < 6 or header[0] != TYPE_TRPC:
+            return None
+
+        method_id = int.from_bytes(header[2:6], "little")
+
+        if method_id in address_methodIDs and len(header) == 8:
+            address = header[6] | (header[7] << 8)
+        else:
+            address = None
+
+        return header[1], method_id, address
+
+    peek = staticmethod(peek)
+
     # *************************************************************************
     def to_tpck(self):
         """Take the packet in all its glory and boil it down to a basic
@@ -291,6 +526,18 @@ class TrpcPacket:
         p.data.extend(self.extra)
         return p
 
+    # *************************************************************************
+    def encode(self):
+        """Return the packet as a line of bytes, ready to write to a socket.
+
+        Same output as str(self.to_tpck()), without the per-byte formatting.
+        """
+        data = bytearray((TYPE_TRPC,))
+        data.extend(self.header.pack()[0])
+        data.extend(self.body.pack()[0])
+        data.extend(self.extra)
+        return data.hex().upper().encode() + b"\n"
+
     # *************************************************************************
     def __str__(self):
         """String representation of the packet."""
@@ -316,3 +563,13 @@ class TrpcPacket:
             return hs
         else:
             return "".join([hs, " <", "".join(["%02X" % x for x in d]), ">"])
+
+
+# *****************************************************************************
+# Cached decoding of received lines. The gateway repeats byte-identical lines
+# all the time, so a repeated line costs one lookup. Lines must be bytes.
+#
+DECODE_CACHE_SIZE = 1024
+
+decode_cached = lru_cache(maxsize=DECODE_CACHE_SIZE)(TrpcPacket.decode)
+peek_cached = lru_cache(maxsize=DECODE_CACHE_SIZE)(TrpcPacket.peek)
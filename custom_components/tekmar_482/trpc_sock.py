@@ -1,20 +1,110 @@
 import asyncio
+from collections import deque
 
-from .trpc_msg import TrpcPacket
+from .transport import Transport, transport_for
+from .trpc_msg import decode_cached
+
+# longest line accepted, in bytes; tHA packets are well under 100
+MAX_FRAME = 256
+
+# shortest valid line: type, service and method ID as hex
+MIN_FRAME = 12
+
+HEX_DIGITS = b"0123456789ABCDEFabcdef"
+
+# bytes taken from the socket at once, so a backlog is read in one go
+READ_SIZE = 65536
+
+
+# ******************************************************************************
+class FrameParser:
+    """Split a received byte stream into packet lines.
+
+    Lines are validated as an even number of hex digits covering at least the
+    packet header. Bad lines and lines longer than MAX_FRAME are counted and
+    dropped. A partial line that grows past MAX_FRAME is discarded up to the
+    next newline, so the buffer never holds more than MAX_FRAME bytes.
+    """
+
+    # **************************************************************************
+    def __init__(self, max_frame: int = MAX_FRAME) -> None:
+        self._buffer = bytearray()
+        self._max_frame = max_frame
+        self._discarding = False
+
+        self.frames = 0
+        self.corrupt = 0
+        self.oversized = 0
+
+    # **************************************************************************
+    def reset(self) -> None:
+        """Drop any partial line, as after a reconnect."""
+        self._buffer.clear()
+        self._discarding = False
+
+    # **************************************************************************
+    def feed(self, data: bytes) -> list[bytes]:
+        """Add received data and return the complete, valid lines in it."""
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        start = 0
+
+        while (end := buffer.find(b"\n", start)) != -1:
+            if self._discarding:
+                self._discarding = False
+            else:
+                frame = bytes(buffer[start:end]).rstrip(b"\r")
+                if len(frame) > self._max_frame:
+                    self.oversized += 1
+                elif self._valid(frame):
+                    frames.append(frame)
+                elif frame:
+                    self.corrupt += 1
+            start = end + 1
+
+        del buffer[:start]
+
+        if len(buffer) > self._max_frame:
+            if not self._discarding:
+                self.oversized += 1
+                self._discarding = True
+            buffer.clear()
+
+        self.frames += len(frames)
+        return frames
+
+    # **************************************************************************
+    @staticmethod
+    def _valid(frame: bytes) -> bool:
+        return (
+            len(frame) >= MIN_FRAME
+            and len(frame) % 2 == 0
+            and not frame.translate(None, HEX_DIGITS)
+        )
 
 
 # ******************************************************************************
 class TrpcSocket:
     # **************************************************************************
-    def __init__(self, addr=None, port=None):
+    def __init__(self, addr=None, port=None, transport: Transport | None = None):
+        """Use transport if given, otherwise the one for addr and port."""
         self._sock_reader = None
         self._sock_writer = None
         self._is_open = False
         self._error = None
 
+        self.parser = FrameParser()
+        self._frames = deque()
+
         self.addr = addr
         self.port = port
 
+        if transport is None:
+            transport = transport_for(addr, port)
+
+        self.transport = transport
+
     # **************************************************************************
     async def open(self) -> bool:
         """Connect to the socket.
@@ -22,9 +112,9 @@ class TrpcSocket:
         Return True if successful, False if not.
         """
         try:
-            self._sock_reader, self._sock_writer = await asyncio.open_connection(
-                self.addr, self.port
-            )
+            self._sock_reader, self._sock_writer = await self.transport.open()
+            self.parser.reset()
+            self._frames.clear()
 
             self._is_open = True
             return True
@@ -40,18 +130,20 @@ class TrpcSocket:
     async def close(self) -> None:
         """Close the socket."""
         if self._sock_writer is not None:
-            try:
-                self._sock_writer.close()
-                await self._sock_writer.wait_closed()
-
-            except Exception:
-                pass
+            sock_writer = self._sock_writer
 
             self._sock_writer = None
             self._sock_reader = None
 
             self._is_open = False
 
+            try:
+                sock_writer.close()
+                await sock_writer.wait_closed()
+
+            except Exception:
+                pass
+
     # **************************************************************************
     async def read(self):
         """Read a packet from the socket.  If no packet is avaialble,
@@ -59,24 +151,68 @@ class TrpcSocket:
 
         Otherwise a tHA object is returned.
         """
-        if self._sock_reader is not None:
-            try:
-                rx_data = await asyncio.wait_for(
-                    self._sock_reader.readline(), timeout=0.5
-                )
-                if rx_data:
-                    return TrpcPacket.from_rx_packet(rx_data.rstrip(b"\n"))
+        rx_data = await self.read_line()
+        if rx_data is not None:
+            return decode_cached(rx_data)
 
-            except asyncio.TimeoutError:
-                pass
+        return None
+
+    # **************************************************************************
+    async def read_line(self) -> bytes | None:
+        """Read one undecoded packet line from the socket, without the line
+        ending.  If no line is available, None is returned.
+
+        Raises ConnectionResetError if the packet server closed the connection.
+        """
+        if not self._frames:
+            await self._fill()
+
+        if self._frames:
+            return self._frames.popleft()
 
         return None
 
+    # **************************************************************************
+    async def read_lines(self) -> list[bytes]:
+        """Read all undecoded packet lines that are available, waiting for
+        the first one like read_line.  The list is empty if there are none.
+        """
+        if not self._frames:
+            await self._fill()
+
+        lines = list(self._frames)
+        self._frames.clear()
+        return lines
+
+    # **************************************************************************
+    async def _fill(self) -> None:
+        """Parse everything the socket has received, up to READ_SIZE bytes."""
+        if self._sock_reader is None:
+            return
+
+        try:
+            rx_data = await asyncio.wait_for(
+                self._sock_reader.read(READ_SIZE), timeout=0.5
+            )
+
+        except asyncio.TimeoutError:
+            return
+
+        if not rx_data:
+            raise ConnectionResetError("Connection closed by packet server")
+
+        self._frames.extend(self.parser.feed(rx_data))
+
     # **************************************************************************
     async def write(self, trpc_packet) -> None:
         """Write a TrpcPacket object to the socket."""
+        await self.write_many([trpc_packet])
+
+    # **************************************************************************
+    async def write_many(self, trpc_packets) -> None:
+        """Write TrpcPacket objects to the socket with one write and drain."""
         if self._sock_writer is not None:
-            self._sock_writer.write(str(trpc_packet.to_tpck()).encode())
+            self._sock_writer.write(b"".join(p.encode() for p in trpc_packets))
             await self._sock_writer.drain()
 
     @property
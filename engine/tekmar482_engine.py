@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""Standalone relay between the Tekmar Gateway 482 and Home Assistant.
+
+Holds the connection to the Tekmar packet server in its own process, so
+gateway writes are paced outside of the Home Assistant event loop. Home
+Assistant connects to the engine instead of the packet server, over a local
+unix socket or TCP port, and uses the same line protocol. Packets are not
+decoded here; the integration still does that.
+
+The engine:
+- reconnects to the packet server with jittered exponential backoff
+- paces packets written to the gateway
+- batches lines sent to each client into one write
+- sends each client only reports that changed a value since the last
+  report it was sent, and everything again every refresh interval
+
+Line keys, framing and backoff come from the integration's protocol modules,
+which do not need Home Assistant. Run it from a checkout of this repository
+with Python 3.10 or newer:
+
+    python3 engine/tekmar482_engine.py --gateway 192.168.1.10:3000 --listen /run/tekmar482.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import logging
+import sys
+import types
+from pathlib import Path
+
+_LOGGER = logging.getLogger("tekmar482.engine")
+
+INTEGRATION_DIR = (
+    Path(__file__).resolve().parent.parent / "custom_components" / "tekmar_482"
+)
+
+# The integration's __init__ imports Home Assistant, so its directory is
+# loaded as a bare package and only the protocol modules are imported.
+_package = types.ModuleType("tekmar_482")
+_package.__path__ = [str(INTEGRATION_DIR)]
+sys.modules.setdefault("tekmar_482", _package)
+
+backoff_delay = importlib.import_module("tekmar_482.helpers").backoff_delay
+protocol = importlib.import_module("tekmar_482.protocol")
+trpc_sock = importlib.import_module("tekmar_482.trpc_sock")
+
+SERVICE_REPORT = b"02"
+
+# bytes waiting to be sent to a client before it is disconnected as stalled
+CLIENT_BUFFER_LIMIT = 256 * 1024
+
+# end of the key fields of a line, by hex method ID
+KEY_ENDS = protocol.line_key_ends(protocol.VALUE_KEY_LENGTHS)
+
+
+def value_key(line: bytes) -> bytes | None:
+    """Return the key of the value a line carries, or None.
+
+    The key is the method ID and the identifying body bytes, so a request
+    and the report that answers it have the same key.
+    """
+    end = KEY_ENDS.get(line[4:12])
+    if end is None or len(line) < end:
+        return None
+
+    return line[4:end]
+
+
+class Client:
+    """A connection from Home Assistant."""
+
+    def __init__(self, reader, writer) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.sent = {}
+        self.pending = []
+        self.suppressed = 0
+
+    def send(self, key: bytes | None, line: bytes) -> None:
+        """Queue a line, unless it repeats the last value sent for key."""
+        if key is not None:
+            if self.sent.get(key) == line:
+                self.suppressed += 1
+                return
+
+            self.sent[key] = line
+
+        self.pending.append(line)
+
+
+class Engine:
+    """Relay between one packet server and any number of clients."""
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        pace: float = 0.1,
+        batch: float = 0.05,
+        refresh: float = 600,
+        backoff_base: float = 0.5,
+        backoff_max: float = 60,
+    ) -> None:
+        self._host = host
+        self._port = port
+        self._pace = pace
+        self._batch = batch
+        self._refresh = refresh
+        self._backoff_base = backoff_base
+        self._backoff_max = backoff_max
+
+        self._clients = set()
+        self._tx_queue = asyncio.Queue()
+        self._writer = None
+        self._connected = asyncio.Event()
+
+    async def run(self, listen: str) -> None:
+        """Serve clients on listen and relay to the packet server."""
+        if listen.startswith("/"):
+            server = await asyncio.start_unix_server(self._handle_client, listen)
+        else:
+            host, _, port = listen.rpartition(":")
+            server = await asyncio.start_server(
+                self._handle_client, host or None, int(port)
+            )
+
+        _LOGGER.info(f"Listening on {listen}")
+
+        async with server:
+            await asyncio.gather(
+                self._run_gateway(),
+                self._run_writer(),
+                self._run_flusher(),
+                self._run_refresh(),
+            )
+
+    async def _run_gateway(self) -> None:
+        attempt = 0
+
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self._host, self._port)
+                parser = trpc_sock.FrameParser()
+
+            except OSError as e:
+                attempt += 1
+                delay = backoff_delay(attempt, self._backoff_base, self._backoff_max)
+                _LOGGER.warning(
+                    f"Connection to {self._host}:{self._port} failed: {e} - "
+                    f"retrying in {delay:.1f} seconds."
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            _LOGGER.info(f"Connected to {self._host}:{self._port}")
+            self._writer = writer
+            self._connected.set()
+
+            # clients have to see every value again after a reconnect
+            for client in self._clients:
+                client.sent.clear()
+
+            while True:
+                try:
+                    data = await reader.read(trpc_sock.READ_SIZE)
+
+                except OSError as e:
+                    _LOGGER.warning(f"Read error: {e}")
+                    break
+
+                if not data:
+                    break
+
+                # only a connection that delivers data resets the backoff
+                attempt = 0
+                for line in parser.feed(data):
+                    self._forward(line)
+
+            if parser.oversized or parser.corrupt:
+                _LOGGER.warning(
+                    f"Dropped {parser.oversized} oversized and "
+                    f"{parser.corrupt} corrupt lines from the gateway"
+                )
+
+            self._connected.clear()
+            self._writer = None
+            writer.close()
+
+            attempt += 1
+            delay = backoff_delay(attempt, self._backoff_base, self._backoff_max)
+            _LOGGER.warning(
+                f"Connection to {self._host}:{self._port} closed - "
+                f"reconnecting in {delay:.1f} seconds."
+            )
+            await asyncio.sleep(delay)
+
+    def _forward(self, line: bytes) -> None:
+        if line[2:4] == SERVICE_REPORT:
+            key = value_key(line)
+        else:
+            key = None
+
+        for client in self._clients:
+            client.send(key, line)
+
+    async def _run_writer(self) -> None:
+        """Write client packets to the gateway, one every pace seconds."""
+        while True:
+            line = await self._tx_queue.get()
+            await self._connected.wait()
+
+            try:
+                self._writer.write(line + b"\n")
+                await self._writer.drain()
+
+            except (AttributeError, OSError) as e:
+                _LOGGER.warning(f"Write error: {e}")
+
+            await asyncio.sleep(self._pace)
+
+    async def _run_flusher(self) -> None:
+        """Send the lines queued for each client in one write.
+
+        Writes are not drained, so a stalled client cannot hold up the
+        others. A client with more than CLIENT_BUFFER_LIMIT bytes still
+        unsent is disconnected instead.
+        """
+        while True:
+            await asyncio.sleep(self._batch)
+
+            for client in list(self._clients):
+                if not client.pending:
+                    continue
+
+                data = b"".join(line + b"\n" for line in client.pending)
+                client.pending.clear()
+
+                try:
+                    client.writer.write(data)
+
+                except OSError:
+                    self._drop_client(client)
+                    continue
+
+                if client.writer.is_closing():
+                    self._drop_client(client)
+
+                elif (
+                    client.writer.transport.get_write_buffer_size()
+                    > CLIENT_BUFFER_LIMIT
+                ):
+                    _LOGGER.warning("Client is not reading, disconnecting")
+                    self._drop_client(client)
+
+    def _drop_client(self, client: Client) -> None:
+        self._clients.discard(client)
+        client.writer.close()
+
+    async def _run_refresh(self) -> None:
+        """Send every value to the clients again from time to time."""
+        while True:
+            await asyncio.sleep(self._refresh)
+
+            for client in self._clients:
+                if client.suppressed:
+                    _LOGGER.debug(f"Suppressed {client.suppressed} repeated reports")
+                client.sent.clear()
+                client.suppressed = 0
+
+    async def _handle_client(self, reader, writer) -> None:
+        client = Client(reader, writer)
+        self._clients.add(client)
+        _LOGGER.info("Client connected")
+
+        parser = trpc_sock.FrameParser()
+
+        try:
+            while data := await reader.read(trpc_sock.READ_SIZE):
+                for line in parser.feed(data):
+                    # the answer to a request has to reach the client
+                    key = value_key(line)
+                    if key is not None:
+                        client.sent.pop(key, None)
+
+                    await self._tx_queue.put(line)
+
+        except OSError:
+            pass
+
+        finally:
+            self._clients.discard(client)
+            writer.close()
+            _LOGGER.info("Client disconnected")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--gateway", required=True, help="packet server address as host:port"
+    )
+    parser.add_argument(
+        "--listen",
+        default="127.0.0.1:3001",
+        help="unix socket path, or host:port, for Home Assistant",
+    )
+    parser.add_argument(
+        "--pace", type=float, default=0.1, help="seconds between gateway writes"
+    )
+    parser.add_argument(
+        "--batch", type=float, default=0.05, help="seconds to batch client lines"
+    )
+    parser.add_argument(
+        "--refresh",
+        type=float,
+        default=600,
+        help="seconds between sending every value again",
+    )
+    parser.add_argument("--debug", action="store_true", help="debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.INFO,
+        format="%(asctime)s %(levelname)s %(message)s",
+    )
+
+    host, _, port = args.gateway.rpartition(":")
+    engine = Engine(
+        host, int(port), pace=args.pace, batch=args.batch, refresh=args.refresh
+    )
+
+    try:
+        asyncio.run(engine.run(args.listen))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Load the integration's modules without running its __init__.
+
+The package __init__ imports Home Assistant, which most modules do not
+need. The integration directory is registered as a bare package named
+tekmar_482, so those modules are tested without Home Assistant installed.
+"""
+
+import sys
+import types
+from pathlib import Path
+
+INTEGRATION_DIR = (
+    Path(__file__).resolve().parent.parent / "custom_components" / "tekmar_482"
+)
+
+_package = types.ModuleType("tekmar_482")
+_package.__path__ = [str(INTEGRATION_DIR)]
+sys.modules.setdefault("tekmar_482", _package)
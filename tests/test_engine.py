@@ -0,0 +1,90 @@
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+from tekmar_482.trpc_msg import TrpcPacket
+
+ENGINE_PATH = Path(__file__).resolve().parent.parent / "engine" / "tekmar482_engine.py"
+
+_spec = importlib.util.spec_from_file_location("tekmar482_engine", ENGINE_PATH)
+engine = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(engine)
+
+
+def line(service, method, **kwargs):
+    packet = TrpcPacket(service=service, method=method, **kwargs)
+    return str(packet.to_tpck()).encode().strip()
+
+
+def test_request_and_report_share_a_key():
+    request = line("Request", "HeatSetpoint", address=1, setback=2)
+    report = line("Report", "HeatSetpoint", address=1, setback=2, setpoint=140)
+    other = line("Report", "HeatSetpoint", address=1, setback=1, setpoint=140)
+
+    assert engine.value_key(request) == engine.value_key(report)
+    assert engine.value_key(report) != engine.value_key(other)
+    assert engine.value_key(line("Report", "DateTime", year=2026)) is None
+
+
+def test_client_is_sent_changed_values_only():
+    client = engine.Client(None, None)
+    first = line("Report", "CurrentTemperature", address=1, temp=1400)
+    changed = line("Report", "CurrentTemperature", address=1, temp=1410)
+    key = engine.value_key(first)
+
+    for report in (first, first, changed):
+        client.send(key, report)
+
+    assert client.pending == [first, changed]
+    assert client.suppressed == 1
+
+
+@pytest.fixture
+def sockets(request):
+    """Allow sockets when pytest-socket, used by Home Assistant tests, blocks them."""
+    if request.config.pluginmanager.hasplugin("socket"):
+        request.getfixturevalue("socket_enabled")
+
+
+def test_relay(sockets):
+    request = line("Request", "CurrentTemperature", address=1)
+    report = line("Report", "CurrentTemperature", address=1, temp=1400)
+
+    async def gateway(reader, writer):
+        while await reader.readline():
+            # repeated reports are only forwarded to answer a request
+            writer.write(report + b"\n" + report + b"\n")
+
+    async def run():
+        gateway_server = await asyncio.start_server(gateway, "127.0.0.1", 0)
+        relay = engine.Engine(
+            "127.0.0.1", gateway_server.sockets[0].getsockname()[1], pace=0, batch=0.01
+        )
+        tasks = [
+            asyncio.create_task(task())
+            for task in (relay._run_gateway, relay._run_writer, relay._run_flusher)
+        ]
+        client_server = await asyncio.start_server(relay._handle_client, "127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection(
+            "127.0.0.1", client_server.sockets[0].getsockname()[1]
+        )
+
+        received = []
+        for _ in range(2):
+            writer.write(request + b"\n")
+            received.append(await asyncio.wait_for(reader.readline(), 5))
+            await asyncio.sleep(0.1)
+
+        assert received == [report + b"\n"] * 2
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(reader.readline(), 0.2)
+
+        writer.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        client_server.close()
+        gateway_server.close()
+
+    asyncio.run(run())
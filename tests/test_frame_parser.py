@@ -0,0 +1,47 @@
+from tekmar_482.trpc_sock import MAX_FRAME, FrameParser
+
+LINE = b"0602370100000500"
+
+
+def test_splits_lines_across_reads():
+    parser = FrameParser()
+
+    assert parser.feed(LINE[:5]) == []
+    assert parser.feed(LINE[5:] + b"\r\n" + LINE) == [LINE]
+    assert parser.feed(b"\n") == [LINE]
+    assert parser.frames == 2
+
+
+def test_drops_corrupt_lines():
+    parser = FrameParser()
+
+    lines = parser.feed(b"06023701\n06023701000005XY\n0602370100000\n\n" + LINE + b"\n")
+
+    assert lines == [LINE]
+    assert parser.corrupt == 3
+
+
+def test_drops_complete_lines_longer_than_max_frame():
+    parser = FrameParser()
+
+    lines = parser.feed(b"00" * MAX_FRAME + b"\n" + LINE + b"\n")
+
+    assert lines == [LINE]
+    assert parser.oversized == 1
+
+
+def test_discards_a_partial_line_past_max_frame_up_to_the_next_newline():
+    parser = FrameParser()
+
+    assert parser.feed(b"00" * MAX_FRAME) == []
+    assert parser.feed(b"00" * 10) == []
+    assert parser.feed(b"00\n" + LINE + b"\n") == [LINE]
+    assert parser.oversized == 1
+
+
+def test_reset_drops_the_partial_line():
+    parser = FrameParser()
+    parser.feed(LINE[:6])
+    parser.reset()
+
+    assert parser.feed(LINE + b"\n") == [LINE]
@@ -0,0 +1,183 @@
+"""Discovery and reconnects of the hub against a fake gateway.
+
+These tests need Home Assistant and pytest-homeassistant-custom-component.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("pytest_homeassistant_custom_component")
+
+from pytest_homeassistant_custom_component.common import (  # noqa: E402
+    MockConfigEntry,
+)
+from tekmar_482 import hub as tekmar_hub  # noqa: E402
+from tekmar_482.const import DOMAIN  # noqa: E402
+from tekmar_482.transport import LoopbackTransport  # noqa: E402
+from tekmar_482.trpc_msg import (  # noqa: E402
+    TrpcPacket,
+    name_from_methodID,
+    serviceID_from_name,
+)
+from tekmar_482.trpc_sock import TrpcSocket  # noqa: E402
+
+# a 544 thermostat with heating and cooling
+DEVICE_TYPE = 99203
+DEVICE_ATTRIBUTES = 0b11
+
+
+class FakeGateway:
+    """Answer the requests of the hub like a packet server would."""
+
+    def __init__(self, loopback: LoopbackTransport, addresses) -> None:
+        self.loopback = loopback
+        self.addresses = list(addresses)
+        self.drop = []
+        self.connections = 0
+
+    async def serve(self) -> None:
+        reader = None
+
+        while True:
+            while self.loopback.server_reader in (None, reader):
+                await asyncio.sleep(0.01)
+
+            reader = self.loopback.server_reader
+            self.connections += 1
+
+            while line := await reader.readline():
+                for reply in self._replies(line.strip()):
+                    self.loopback.server_writer.write(reply)
+
+    def disconnect(self) -> None:
+        self.loopback.server_writer.close()
+
+    def _replies(self, line: bytes) -> list[bytes]:
+        header = TrpcPacket.peek(line)
+        if header is None:
+            return []
+
+        method = name_from_methodID[header[1]]
+        address = header[2]
+        request = TrpcPacket.decode(line)
+
+        if (method, address) in self.drop:
+            self.drop.remove((method, address))
+            return []
+
+        # devices that left the bus do not answer
+        if address and address not in self.addresses:
+            return []
+
+        if method == "FirmwareRevision":
+            return [report(method, revision=7)]
+        if method == "ProtocolVersion":
+            return [report(method, version=3)]
+        if method == "DeviceInventory":
+            return [report(method, address=a) for a in self.addresses] + [
+                report(method, address=0)
+            ]
+        if method == "DeviceType":
+            return [report(method, address=address, type=DEVICE_TYPE)]
+        if method == "DeviceVersion":
+            return [report(method, address=address, j_number=1)]
+        if method == "DeviceAttributes":
+            return [report(method, address=address, attributes=DEVICE_ATTRIBUTES)]
+        if method == "SetbackEvents":
+            return [report(method, address=address, events=2)]
+
+        # anything else is reported back with the values it was sent with
+        if method in ("SetbackEnable", "ReportingState") or (
+            request.serviceID == serviceID_from_name["Request"]
+        ):
+            return [
+                report(
+                    method, **{name: getattr(request, name) for name in request.fields}
+                )
+            ]
+
+        return []
+
+
+def report(method, **kwargs) -> bytes:
+    return TrpcPacket(service="Report", method=method, **kwargs).encode()
+
+
+async def wait_until(condition, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.05)
+
+
+def addresses(hub) -> list[int]:
+    return sorted(device.device_id for device in hub.tha_devices)
+
+
+@pytest.fixture
+async def gateway_hub(hass):
+    """Yield a started hub and the fake gateway it is connected to."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    hub = tekmar_hub.TekmarHub(hass, entry.entry_id, "Tekmar", "loopback", 0, True)
+    loopback = LoopbackTransport()
+    hub._sock = TrpcSocket(transport=loopback)
+
+    gateway = FakeGateway(loopback, addresses=(1, 2))
+    server = asyncio.create_task(gateway.serve())
+
+    await hub.async_init_tha()
+    hub.start(entry)
+
+    yield hub, gateway
+
+    await hub.shutdown()
+    server.cancel()
+
+
+async def test_devices_are_added_as_they_are_found(gateway_hub):
+    hub, gateway = gateway_hub
+
+    await wait_until(lambda: addresses(hub) == [1, 2])
+
+    assert not hub._tha_discovery
+    assert hub._devices_by_address.keys() == {1, 2}
+
+
+async def test_lost_inventory_reply_is_requested_again(gateway_hub, monkeypatch):
+    hub, gateway = gateway_hub
+    monkeypatch.setattr(tekmar_hub, "DISCOVERY_TIMEOUT", 1)
+    await wait_until(lambda: addresses(hub) == [1, 2])
+
+    gateway.drop.append(("DeviceAttributes", 3))
+    gateway.addresses.append(3)
+    hub.request_inventory()
+
+    await wait_until(lambda: 3 in hub._tha_discovery)
+    await wait_until(lambda: addresses(hub) == [1, 2, 3])
+
+
+async def test_reconnect_finds_new_devices(gateway_hub):
+    hub, gateway = gateway_hub
+    await wait_until(lambda: addresses(hub) == [1, 2])
+
+    gateway.addresses.append(3)
+    gateway.disconnect()
+
+    await wait_until(lambda: gateway.connections == 2)
+    await wait_until(lambda: addresses(hub) == [1, 2, 3])
+
+
+async def test_device_missing_from_two_inventories_is_removed(gateway_hub):
+    hub, gateway = gateway_hub
+    await wait_until(lambda: addresses(hub) == [1, 2])
+
+    gateway.addresses.remove(2)
+    hub.request_inventory()
+    await wait_until(lambda: 2 in hub._tha_inventory_missing)
+    assert addresses(hub) == [1, 2]
+
+    hub.request_inventory()
+    await wait_until(lambda: addresses(hub) == [1])
+    assert 2 not in hub._devices_by_address
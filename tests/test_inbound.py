@@ -0,0 +1,55 @@
+from tekmar_482.inbound import InboundQueue
+from tekmar_482.protocol import CONFLATE_KEY_LENGTHS
+from tekmar_482.trpc_msg import TrpcPacket
+
+
+def report(method, **kwargs):
+    return TrpcPacket(service="Report", method=method, **kwargs).encode().strip()
+
+
+def test_latest_report_of_a_value_wins():
+    queue = InboundQueue(CONFLATE_KEY_LENGTHS)
+    first = report("CurrentTemperature", address=1, temp=1400)
+    other = report("CurrentTemperature", address=2, temp=1500)
+    latest = report("CurrentTemperature", address=1, temp=1450)
+
+    for line in (first, other, latest):
+        queue.put(line)
+
+    assert len(queue) == 2
+    assert queue.conflated == 1
+    assert queue.get() == other
+    assert queue.get() == latest
+    assert queue.get() is None
+    assert len(queue) == 0
+
+
+def test_index_fields_are_part_of_the_key():
+    queue = InboundQueue(CONFLATE_KEY_LENGTHS)
+    day = report("HeatSetpoint", address=1, setback=0, setpoint=140)
+    night = report("HeatSetpoint", address=1, setback=1, setpoint=130)
+
+    queue.put(day)
+    queue.put(night)
+
+    assert queue.conflated == 0
+    assert [queue.get(), queue.get()] == [day, night]
+
+
+def test_lines_without_a_key_keep_their_order():
+    queue = InboundQueue(CONFLATE_KEY_LENGTHS)
+    lines = [report("DeviceInventory", address=n) for n in (1, 2, 1)]
+
+    for line in lines:
+        queue.put(line)
+
+    assert [queue.get() for _ in lines] == lines
+
+
+def test_clear():
+    queue = InboundQueue(CONFLATE_KEY_LENGTHS)
+    queue.put(report("OutdoorTemperature", temp=100))
+    queue.clear()
+
+    assert len(queue) == 0
+    assert queue.get() is None
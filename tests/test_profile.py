@@ -0,0 +1,41 @@
+import dataclasses
+
+import pytest
+from tekmar_482.const import DeviceAttributes, ThaType
+from tekmar_482.profile import DeviceProfile
+
+HEAT_COOL = DeviceAttributes(ZoneHeating=True, ZoneCooling=True)
+
+
+def test_build_from_type_and_attributes():
+    profile = DeviceProfile.build(99203, HEAT_COOL, 3)
+
+    assert profile.device_type == ThaType.THERMOSTAT
+    assert profile.model == "544"
+    assert profile.heat_cool
+    assert profile.fan
+    assert profile.fan_steps
+    assert not profile.slab_setpoint
+    assert not profile.fan_percent
+
+
+@pytest.mark.parametrize(
+    "pr_ver, humidity, floor_temperature",
+    [(1, False, False), (2, True, False), (3, True, True), (None, False, False)],
+)
+def test_protocol_version_gates_features(pr_ver, humidity, floor_temperature):
+    profile = DeviceProfile.build(105102, DeviceAttributes(), pr_ver)
+
+    assert profile.humidity == humidity
+    assert profile.floor_temperature == floor_temperature
+
+
+def test_humidity_needs_a_humidity_device():
+    assert not DeviceProfile.build(105101, DeviceAttributes(), 3).humidity
+
+
+def test_profile_is_frozen():
+    profile = DeviceProfile.build(99203, HEAT_COOL, 3)
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        profile.fan = False
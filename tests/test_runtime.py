@@ -0,0 +1,68 @@
+from tekmar_482.const import ThaActiveDemand
+from tekmar_482.runtime import DemandRuntime, RollingWindow
+
+HOUR = 3600
+START = 1000 * 86400
+
+
+def test_window_drops_old_buckets():
+    window = RollingWindow(length=60, buckets=6)
+    window.add(START, START + 30)
+    assert window.total == 30
+
+    # the first bucket leaves the window whole
+    window.advance(START + 65)
+    assert window.total == 20
+
+    window.advance(START + 200)
+    assert window.total == 0
+
+
+def test_window_counts_only_time_inside_it():
+    window = RollingWindow(length=60, buckets=6)
+    window.add(START, START + 600)
+
+    # the last bucket is still filling, so five whole buckets are kept
+    assert window.total == 50
+
+
+def test_runtime_and_duty_cycle():
+    runtime = DemandRuntime()
+    runtime.update(ThaActiveDemand.HEAT, START)
+    runtime.update(ThaActiveDemand.IDLE, START + HOUR / 2)
+
+    now = START + HOUR - 1
+    assert runtime.runtime("heat", now) == HOUR / 2
+    assert runtime.runtime("idle", now) == HOUR / 2 - 1
+    assert runtime.duty_cycle("1h", now) == 50
+    assert runtime.hours("heat", now) == 0.5
+    assert runtime.percent("24h", now) == 2
+
+
+def test_unknown_demand_is_not_counted():
+    runtime = DemandRuntime()
+    runtime.update(ThaActiveDemand.COOL, START)
+    runtime.update(None, START + 60)
+
+    assert runtime.runtime("cool", START + HOUR) == 60
+
+
+def test_changed_only_when_a_shown_value_changes():
+    runtime = DemandRuntime()
+    runtime.update(ThaActiveDemand.HEAT, START)
+
+    assert runtime.changed(START)
+    assert not runtime.changed(START + 1)
+    assert runtime.changed(START + 60)
+
+
+def test_saved_totals_and_windows_are_restored():
+    runtime = DemandRuntime()
+    runtime.update(ThaActiveDemand.HEAT, START)
+    runtime.update(ThaActiveDemand.IDLE, START + HOUR)
+
+    restored = DemandRuntime.from_dict(runtime.as_dict())
+
+    assert restored.runtime("heat", START + 2 * HOUR) == HOUR
+    assert restored.runtime("idle", START + 2 * HOUR) == 0
+    assert restored.duty_cycle("24h", START + 2 * HOUR) == 100 / 24
@@ -0,0 +1,93 @@
+from tekmar_482.state import ZoneStateTable
+
+
+def test_slots_are_reset_and_reused():
+    table = ZoneStateTable()
+    first = table.allocate()
+    second = table.allocate()
+    table.set(first, "heat_setpoint", 140, 1)
+
+    table.release(first)
+    assert len(table) == 1
+    assert table.allocate() == first
+    assert table.get(first, "heat_setpoint", 1) is None
+    assert second != first
+
+
+def test_set_reports_changes():
+    table = ZoneStateTable()
+    slot = table.allocate()
+
+    assert table.set(slot, "mode_setting", 1)
+    assert not table.set(slot, "mode_setting", 1)
+    assert table.get(slot, "mode_setting") == 1
+
+
+def test_aggregates_follow_updates():
+    table = ZoneStateTable()
+    a, b, c = (table.allocate() for _ in range(3))
+    table.set(a, "current_temperature", 1400)
+    table.set(b, "current_temperature", 1500)
+    table.set(a, "active_demand", 1)
+    table.set(b, "active_demand", 1)
+
+    assert table.mean("current_temperature") == 1450
+    assert table.minimum("current_temperature") == 1400
+    assert table.count("active_demand", 1) == 2
+
+    table.set(a, "current_temperature", 1600)
+    table.set(b, "active_demand", 0)
+    table.set(c, "current_temperature", 1300)
+    table.release(c)
+
+    assert table.mean("current_temperature") == 1550
+    assert table.minimum("current_temperature") == 1500
+    assert table.count("active_demand", 1) == 1
+    assert table.count("active_demand", 0) == 1
+
+
+def test_no_reported_values():
+    table = ZoneStateTable()
+    table.allocate()
+
+    assert table.mean("current_temperature") is None
+    assert table.minimum("current_temperature") is None
+
+
+def test_slots_that_are_not_aggregated():
+    table = ZoneStateTable()
+    zone = table.allocate()
+    setpoint = table.allocate(aggregated=False)
+    table.set(zone, "current_temperature", 1400)
+    table.set(setpoint, "current_temperature", 1200)
+    table.set(setpoint, "active_demand", 1)
+
+    assert table.mean("current_temperature") == 1400
+    assert table.minimum("current_temperature") == 1400
+    assert table.count("active_demand", 1) == 0
+
+
+def test_minimum_ignores_a_reused_slot_that_is_not_aggregated():
+    table = ZoneStateTable()
+    zone = table.allocate()
+    old = table.allocate()
+    table.set(zone, "current_temperature", 1400)
+    table.set(old, "current_temperature", 1200)
+    table.release(old)
+
+    reused = table.allocate(aggregated=False)
+    assert reused == old
+    table.set(reused, "current_temperature", 1200)
+
+    assert table.minimum("current_temperature") == 1400
+
+
+def test_minimum_heap_is_pruned():
+    table = ZoneStateTable()
+    slot = table.allocate()
+
+    for value in range(1000):
+        table.set(slot, "current_temperature", value)
+
+    assert len(table._heaps["current_temperature"]) < 100
+    assert table.minimum("current_temperature") == 999
@@ -0,0 +1,57 @@
+from tekmar_482.timer_wheel import TimerWheel
+
+
+def test_expires_keys_when_their_tick_passes():
+    wheel = TimerWheel(tick=1, slots=8, now=0)
+    wheel.schedule("a", 2.5)
+    wheel.schedule("b", 5)
+
+    assert wheel.advance(2) == []
+    assert wheel.advance(3) == ["a"]
+    assert "a" not in wheel
+    assert "b" in wheel
+    assert wheel.advance(5) == ["b"]
+    assert len(wheel) == 0
+
+
+def test_schedule_replaces_earlier_deadline():
+    wheel = TimerWheel(tick=1, slots=8, now=0)
+    wheel.schedule("a", 2)
+    wheel.schedule("a", 6)
+
+    assert wheel.advance(4) == []
+    assert wheel.advance(6) == ["a"]
+
+
+def test_cancel():
+    wheel = TimerWheel(tick=1, slots=8, now=0)
+    wheel.schedule("a", 2)
+    wheel.cancel("a")
+    wheel.cancel("missing")
+
+    assert wheel.advance(10) == []
+
+
+def test_deadlines_beyond_one_turn_wait_for_their_round():
+    wheel = TimerWheel(tick=1, slots=4, now=0)
+    wheel.schedule("late", 10)
+
+    # the key shares a slot with ticks 2 and 6, which pass first
+    assert wheel.advance(2) == []
+    assert wheel.advance(6) == []
+    assert wheel.advance(10) == ["late"]
+
+
+def test_advance_past_every_slot_at_once():
+    wheel = TimerWheel(tick=1, slots=4, now=0)
+    for n in range(1, 10):
+        wheel.schedule(n, n)
+
+    assert sorted(wheel.advance(100)) == list(range(1, 10))
+
+
+def test_deadline_in_the_past_expires_on_the_next_tick():
+    wheel = TimerWheel(tick=1, slots=4, now=5)
+    wheel.schedule("a", 1)
+
+    assert wheel.advance(6) == ["a"]
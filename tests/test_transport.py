@@ -0,0 +1,74 @@
+import asyncio
+
+import pytest
+from tekmar_482.transport import (
+    LoopbackTransport,
+    TcpTransport,
+    UnixTransport,
+    transport_for,
+)
+from tekmar_482.trpc_msg import TrpcPacket, methodID_from_name
+from tekmar_482.trpc_sock import TrpcSocket
+
+
+def encode(packet):
+    return str(packet.to_tpck()).encode()
+
+
+def test_transport_for_address():
+    assert isinstance(transport_for("/run/tekmar482.sock", 3000), UnixTransport)
+    assert isinstance(transport_for("192.168.1.10", 3000), TcpTransport)
+
+
+def test_socket_over_loopback():
+    async def run():
+        loopback = LoopbackTransport()
+        sock = TrpcSocket(transport=loopback)
+        assert await sock.open()
+
+        request = TrpcPacket(service="Request", method="FirmwareRevision")
+        await sock.write(request)
+        assert await loopback.server_reader.readline() == encode(request)
+
+        report = TrpcPacket(service="Report", method="FirmwareRevision", revision=7)
+        loopback.server_writer.write(encode(report) * 2)
+
+        message = await sock.read()
+        assert message.methodID == methodID_from_name["FirmwareRevision"]
+        assert message.revision == 7
+        assert await sock.read_line() == encode(report).strip()
+
+        await sock.close()
+        assert not sock.is_open
+
+    asyncio.run(run())
+
+
+def test_closed_by_packet_server():
+    async def run():
+        loopback = LoopbackTransport()
+        sock = TrpcSocket(transport=loopback)
+        await sock.open()
+        loopback.server_writer.close()
+
+        with pytest.raises(ConnectionResetError):
+            await sock.read_line()
+
+    asyncio.run(run())
+
+
+def test_reopen_drops_lines_of_the_old_connection():
+    async def run():
+        loopback = LoopbackTransport()
+        sock = TrpcSocket(transport=loopback)
+        await sock.open()
+        loopback.server_writer.write(b"060237010000")
+
+        await sock.read_line()
+        await sock.close()
+        await sock.open()
+
+        loopback.server_writer.write(b"0500\n")
+        assert await sock.read_line() is None
+
+    asyncio.run(run())
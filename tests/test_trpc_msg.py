@@ -0,0 +1,44 @@
+from tekmar_482.const import DeviceAttributes
+from tekmar_482.trpc_msg import (
+    TrpcPacket,
+    decode_device_attributes,
+    methodID_from_name,
+    serviceID_from_name,
+)
+
+
+def test_device_attributes_flags():
+    assert decode_device_attributes(0b0101) == DeviceAttributes(
+        ZoneHeating=True, SlabSetpoint=True
+    )
+    assert decode_device_attributes(0b1010) == DeviceAttributes(
+        ZoneCooling=True, FanPercent=True
+    )
+
+
+def test_decoded_report_carries_attribute_flags():
+    packet = TrpcPacket(
+        service="Report", method="DeviceAttributes", address=3, attributes=0b11
+    )
+    line = str(packet.to_tpck()).encode()
+
+    message = TrpcPacket.decode(line.strip())
+
+    assert message.address == 3
+    assert message.attributes.ZoneHeating
+    assert message.attributes.ZoneCooling
+    assert not message.attributes.FanPercent
+
+
+def test_peek_reads_the_header_only():
+    packet = TrpcPacket(
+        service="Report", method="CurrentTemperature", address=5, temp=1400
+    )
+    line = str(packet.to_tpck()).encode()
+
+    service, method_id, address = TrpcPacket.peek(line.strip())
+
+    assert service == serviceID_from_name["Report"]
+    assert method_id == methodID_from_name["CurrentTemperature"]
+    assert address == 5
+    assert TrpcPacket.peek(b"06") is None